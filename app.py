@@ -4,8 +4,30 @@ import json
 import asyncio
 from pathlib import Path
 import requests
+import numpy as np
+import pandas as pd
 import re
 import datetime
+import copy
+import threading
+import time
+import random
+import hashlib
+import sqlite3
+import itertools
+import math
+import uuid
+import bisect
+import functools
+import contextvars
+import zoneinfo
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests.adapters import HTTPAdapter
 from streamlit_local_storage import LocalStorage
 
 
@@ -14,9 +36,114 @@ report_maker_url = st.secrets["report-maker-url"]
 db_handler_url = st.secrets["db-handler-url"]
 app_manager_url = st.secrets["app-manager-url"]
 
-user_id = None
-keyword_logs = None
-db_handler = None
+# 캐시 유지 시간 (초)
+SETTINGS_CACHE_TTL = 60
+APP_CONFIG_CACHE_TTL = 600
+KEYWORDS_SEARCHED_CACHE_TTL = 300
+
+# 같은 기간/소스의 수동 키워드 검색 결과를 세션 간에 공유하는 시간 (초)
+SEARCH_CACHE_TTL = 30 * 60
+
+# 소스별 검색 모드: 동시에 검색할 소스 수와 소스별 제한 시간 (초)
+SEARCH_SOURCE_CONCURRENCY = 4
+SEARCH_SOURCE_TIMEOUT = 120
+
+# 설정 변경을 모아서 저장하기까지 기다리는 시간 (초)
+SETTING_FLUSH_DELAY = 1.5
+
+# 로컬 디스크 캐시 위치
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+# 세션별 응답 로그 제한. 큰 응답은 디스크에 두고 메모리에는 요약만 보관
+RESPONSE_LOG_MAX_ENTRIES = 200
+RESPONSE_LOG_MAX_BYTES = 2 * 1024 * 1024
+RESPONSE_LOG_SPILL_BYTES = 64 * 1024
+RESPONSE_LOG_SPILL_MAX_AGE = 24 * 60 * 60
+# 디스크에 옮긴 응답 로그 전체 크기 제한과 정리 주기 (초). 넘으면 오래된 파일부터 지움
+RESPONSE_LOG_SPILL_MAX_TOTAL_BYTES = 512 * 1024 * 1024
+RESPONSE_LOG_SPILL_SWEEP_INTERVAL = 10 * 60
+
+# 사용자별 상태(응답 로그, 검색 기간, 선택 목록) 저장소. secrets의 state-backend가
+# "sqlite"이면 여러 프로세스/서버가 공유하는 파일(state-backend-path)에 저장
+STATE_BACKEND_PATH = CACHE_DIR / "state.sqlite3"
+# 삭제 표시를 남겨 두는 컬렉션별 버전 수. 이보다 오래된 사본은 전체를 다시 읽음
+STATE_TOMBSTONE_KEEP = 1000
+
+# 작성된 보고서 캐시 (모든 세션과 서버 재시작 사이에 공유)
+REPORT_CACHE_PATH = CACHE_DIR / "reports.sqlite3"
+REPORT_CACHE_MAX_ENTRIES = 500
+REPORT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# 엔드포인트별 (connect, read) 타임아웃 (초), secrets의 http-timeouts로 덮어쓸 수 있음
+DEFAULT_HTTP_TIMEOUT = (3.05, 30)
+HTTP_TIMEOUTS = {
+    "/searchKeyword": (3.05, 300),
+    "/makeReport": (3.05, 600),
+    "/makeReportNew": (3.05, 600),
+    "/getKeywordsSearched": (3.05, 60),
+}
+HTTP_POOL_SIZE = 32
+HTTP_GET_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.3
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 한 번의 실행에서 첫 화면 조회(설정, 앱 설정, 키워드 기록)를 기다리는 시간 (초)
+# 넘기면 마지막으로 받은 값으로 그리고, 늦은 응답이 캐시를 채우면
+# STALE_REFRESH_INTERVAL초 간격의 확인에서 다시 그림 (secrets의 rerun-latency-budget로 변경)
+RERUN_LATENCY_BUDGET = 2.5
+STALE_REFRESH_INTERVAL = 1
+# 엔드포인트별 서킷 브레이커: 연속 CIRCUIT_BREAKER_FAILURES번 실패하면
+# CIRCUIT_BREAKER_COOLDOWN초 동안 요청을 보내지 않고 바로 실패
+CIRCUIT_BREAKER_FAILURES = 5
+CIRCUIT_BREAKER_COOLDOWN = 30
+DEFAULT_APP_TITLE = "Construction Insights"
+
+# 보고서 작성 작업 상태를 확인하는 주기 (초)
+REPORT_POLL_INTERVAL = 1
+REPORT_STREAM_POLL_INTERVAL = 0.5
+REPORT_JOB_WORKERS = 4
+REPORT_JOB_HISTORY = 200
+
+# 구간별 소요 시간 집계: 구간마다 최근 METRICS_WINDOW개로 p50/p95를 계산하고
+# METRICS_EXPORT_INTERVAL초마다 JSON/Prometheus 텍스트 파일로 내보냄
+METRICS_WINDOW = 500
+METRICS_EXPORT_INTERVAL = 15
+METRICS_EXPORT_DIR = CACHE_DIR / "metrics"
+
+# auto-cron 설정 시각에 미리 실행하는 기록/보고서 캐시 채우기 (secrets의 precompute-scheduler로 사용)
+# 설정 시각에 최대 PRECOMPUTE_JITTER초의 무작위 지연을 더해 사용자별 실행을 분산
+PRECOMPUTE_JITTER = 10 * 60
+PRECOMPUTE_WORKERS = 2
+PRECOMPUTE_POLL_INTERVAL = 60
+# auto-cron 시각을 해석하는 시간대 (secrets의 precompute-timezone으로 변경)
+PRECOMPUTE_TIMEZONE = "Asia/Seoul"
+# 백엔드의 자동 검색이 끝나 오늘 기록이 생길 때까지 다시 확인하는 간격 (초)과 횟수
+PRECOMPUTE_RETRY_INTERVAL = 10 * 60
+PRECOMPUTE_RETRY_LIMIT = 6
+# 최근 날짜의 키워드 중 미리 보고서를 작성해 둘 개수
+PRECOMPUTE_REPORT_LIMIT = 5
+
+# 날짜별 키워드/뉴스 탭에서 한 번에 보여주는 날짜 수
+HISTORY_PAGE_SIZE = 7
+# 키워드 기록 표에서 고유 값이 이 비율 이하인 문자열 필드는 category로 저장
+HISTORY_CATEGORY_RATIO = 0.5
+# 단어별 토큰화 결과를 캐시하는 단어 수
+SEARCH_TOKEN_CACHE_SIZE = 100_000
+# 기록 검색 토큰: 한글 음절 연속 또는 그 밖의 문자/숫자 연속
+SEARCH_TOKEN_PATTERN = re.compile(r"[\uac00-\ud7a3]+|[^\W\uac00-\ud7a3_]+")
+# 공백으로만 떨어진 한글 두 음절 (띄어 쓴 "건설 안전"을 붙여 쓴 "건설안전"으로도 찾기 위한 bigram)
+SEARCH_SPACED_BIGRAM_PATTERN = re.compile(r"([\uac00-\ud7a3])\s+(?=([\uac00-\ud7a3]))")
+# 검색어 끝에서 떼어 내는 조사 (긴 것부터 확인)
+SEARCH_QUERY_PARTICLES = (
+    "에서 에게 으로 부터 까지 처럼 보다 하고 이나 라는 과 와 을 를 이 가 은 는 의 에 로 도 만"
+).split()
+EMPTY_KEYWORDS_SEARCHED = {
+    "data": {
+        "keywords": {},
+        "documents": {},
+        "viewKeyMap": {"keywordKeyMap": {}, "documentKeyMap": {}},
+    }
+}
 
 
 class SearchKeywordType(Enum):
@@ -29,6 +156,13 @@ class TaskType(Enum):
     REPORT = "report"
 
 
+class ReportJobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class SettingsType(Enum):
     AUTO_CRON = "auto-cron"
     AUTO_KEYWORD = "auto-keyword"
@@ -61,13 +195,18 @@ class SearchSourceList:
 
 
 class DisplayManager:
+    def __init__(self, context):
+        self.db_handler = context.db_handler
+        self.selection = context.keyword_logs.selection
+        self.search_index = context.search_index
+
     def show_settings(self, setting, settings_type: SettingsType):
         if settings_type == SettingsType.AUTO_CRON:
             st.toggle(
                 setting["autoDaily"]["executionStatusLabel"],
                 value=setting["autoDaily"]["executionStatus"],
                 key=setting["autoDaily"]["executionStatusKey"],
-                on_change=lambda: DBHandler().update_setting(
+                on_change=lambda: self.db_handler.queue_setting_update(
                     user_id=setting["userId"],
                     key=setting["autoDaily"]["executionStatusKey"],
                     value={
@@ -94,7 +233,7 @@ class DisplayManager:
                         setting["autoDaily"]["executionTime"], "%H:%M"
                     ),
                     key=setting["autoDaily"]["executionTimeKey"],
-                    on_change=lambda: DBHandler().update_setting(
+                    on_change=lambda: self.db_handler.queue_setting_update(
                         user_id=setting["userId"],
                         key=setting["autoDaily"]["executionTimeKey"],
                         value={
@@ -126,7 +265,7 @@ class DisplayManager:
         for source in setting.get("sources", []):
 
             def on_change_callback(source=source):
-                DBHandler().update_setting(
+                self.db_handler.queue_setting_update(
                     user_id=setting["userId"],
                     key=source["checkboxKey"],
                     value={
@@ -198,47 +337,120 @@ class DisplayManager:
                         ],  # VIEW#DATE#2025-01-23#KEYWORD#artificial_intelligence_in_construction
                     )
 
-    def show_keywords_searched(self, keywords_keyword, keywords_document):
+    def show_keywords_searched(self, history):
+        query = st.text_input(
+            "키워드/뉴스 검색",
+            key="history_search",
+            placeholder="키워드, 뉴스 제목, 본문",
+        )
+        matches = self.search_index.search(history, query)
+        if matches is not None:
+            st.caption(
+                f"검색 결과: 키워드 {sum(map(len, matches['keywords'].values()))}개, "
+                f"뉴스 {sum(map(len, matches['documents'].values()))}개"
+            )
         tab1, tab2 = st.tabs(["Keyword", "News"])
 
-        with tab1:
-            for date, keyword in list(keywords_keyword.items())[::-1]:
-                date_expander = st.expander(date, expanded=False)
-                with date_expander:
-                    for keyword in keyword:
-                        st.checkbox(
-                            keyword["keyword"]["viewLabel"],
-                            value=False,
-                            key=keyword["keyword"]["viewCheckboxKey"],
-                        )
-                        for document in keyword["documents"]:
-                            st.markdown(
-                                "<p style='font-size:14px;margin-left:18px;'>\n"
-                                f"<a style='text-decoration: none; \n"
-                                "color: inherit;' \n"
-                                f"href='{document['url']}' target='_blank'>{document['titleShort']}</a>\n"
-                                "</p>",
-                                unsafe_allow_html=True,
-                            )
-        with tab2:
-            for date, document in list(keywords_document.items())[::-1]:
-                date_expander = st.expander(date, expanded=False)
-                with date_expander:
-                    for document in document:
-                        st.markdown(
-                            "<p style='font-size:20px;margin-left:-4px;'>\n"
-                            f"<a style='text-decoration: none; \n"
-                            "color: inherit;' \n"
-                            f"href='{document['url']}' target='_blank'>{document['titleShort']}</a>\n"
-                            "</p>",
-                            unsafe_allow_html=True,
-                        )
-                        for keyword in document["keywords"]:
-                            st.checkbox(
-                                keyword["viewLabel"],
-                                value=False,
-                                key=keyword["viewCheckboxKey"],
-                            )
+        for tab, tab_name, field, show_date in (
+            (tab1, "keyword", "keywords", self.show_keyword_date),
+            (tab2, "news", "documents", self.show_document_date),
+        ):
+            with tab:
+                if matches is None:
+                    self.show_dates(
+                        tab_name,
+                        history.get_date_counts(field),
+                        functools.partial(history.get_items, field),
+                        show_date,
+                    )
+                else:
+                    # 검색 중에는 일치하는 항목이 있는 날짜만 펼친 상태로 표시
+                    positions_by_date = matches[field]
+                    self.show_dates(
+                        tab_name,
+                        pd.Series(
+                            {
+                                date: len(positions)
+                                for date, positions in positions_by_date.items()
+                            },
+                            dtype="Int32",
+                        ).sort_index(ascending=False),
+                        lambda date, field=field, positions_by_date=positions_by_date: (
+                            history.get_items(field, date, positions_by_date[date])
+                        ),
+                        show_date,
+                        expanded=True,
+                    )
+
+    def show_dates(self, tab_name, date_counts, get_items, show_date, expanded=False):
+        """최근 날짜부터 HISTORY_PAGE_SIZE개씩 표시하고, 펼친 날짜의 내용만 그립니다.
+
+        date_counts는 최근 날짜부터 정렬된 날짜별 항목 수이며, 펼친 날짜의 항목만
+        get_items(date)로 dict를 만듭니다. expanded이면 펼침 토글 없이 모든 날짜의 내용을 그립니다.
+        """
+        pages_key = f"history_pages_{tab_name}"
+        pages = st.session_state.get(pages_key, 1)
+
+        for date, count in date_counts.iloc[: pages * HISTORY_PAGE_SIZE].items():
+            if expanded:
+                st.write(f"{date} ({count})")
+                is_open = True
+            else:
+                is_open = st.toggle(
+                    f"{date} ({count})", key=f"history_open_{tab_name}_{date}"
+                )
+            if is_open:
+                with st.container(border=True):
+                    show_date(get_items(date))
+
+        if len(date_counts) > pages * HISTORY_PAGE_SIZE:
+
+            def load_older():
+                st.session_state[pages_key] = pages + 1
+
+            st.button(
+                "이전 날짜 더 보기", key=f"history_more_{tab_name}", on_click=load_older
+            )
+
+    def show_keyword_date(self, keywords):
+        for keyword in keywords:
+            view_key = keyword["keyword"]["viewCheckboxKey"]
+            st.checkbox(
+                keyword["keyword"]["viewLabel"],
+                value=self.selection.is_selected(view_key),
+                key=view_key,
+                on_change=self.selection.on_change,
+                args=(SelectionStore.KEYWORD, view_key),
+            )
+            for document in keyword["documents"]:
+                st.markdown(
+                    "<p style='font-size:14px;margin-left:18px;'>\n"
+                    f"<a style='text-decoration: none; \n"
+                    "color: inherit;' \n"
+                    f"href='{document['url']}' target='_blank'>{document['titleShort']}</a>\n"
+                    "</p>",
+                    unsafe_allow_html=True,
+                )
+
+    def show_document_date(self, documents):
+        for document in documents:
+            st.markdown(
+                "<p style='font-size:20px;margin-left:-4px;'>\n"
+                f"<a style='text-decoration: none; \n"
+                "color: inherit;' \n"
+                f"href='{document['url']}' target='_blank'>{document['titleShort']}</a>\n"
+                "</p>",
+                unsafe_allow_html=True,
+            )
+            for keyword in document["keywords"]:
+                view_key = keyword["viewCheckboxKey"]
+                st.checkbox(
+                    keyword["viewLabel"],
+                    value=self.selection.is_selected(view_key),
+                    key=view_key,
+                    on_change=self.selection.on_change,
+                    args=(SelectionStore.DOCUMENT, view_key),
+                )
 
     def show_selected_keywords(self):
         st.session_state["selected_keywords"] = []
@@ -303,21 +515,644 @@ class Settings:
         return f"키워드 검색 {self.get_search_period()}"
 
 
+def get_fingerprint(item):
+    """dict 내용 전체로 만든 해시 (식별 필드가 없을 때 사용)"""
+    return hashlib.sha1(
+        json.dumps(item, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def get_keyword_identity(keyword):
+    """키워드는 (en, ko) 쌍으로 식별합니다."""
+    if keyword.get("en") is None and keyword.get("ko") is None:
+        return get_fingerprint(keyword)
+    return (keyword.get("en"), keyword.get("ko"))
+
+
+def get_document_identity(document):
+    """뉴스는 URL로 식별합니다."""
+    return document.get("url") or get_fingerprint(document)
+
+
+def remove_duplicates(items, identity):
+    """identity가 같은 항목 중 처음 나온 것만 순서대로 남깁니다.
+
+    항목마다 식별자를 한 번만 계산하고 set으로 비교하므로 O(n)입니다.
+    """
+    seen = set()
+    unique_items = []
+    for item in items:
+        item_id = identity(item)
+        if item_id not in seen:
+            seen.add(item_id)
+            unique_items.append(item)
+    return unique_items
+
+
+class MemoryStateBackend:
+    """세션 메모리에 사용자 상태를 보관하는 기본 저장소입니다.
+
+    세션마다 하나씩 만들어 세션 스테이트에 두므로 다른 세션이나 프로세스와 공유하지 않으며,
+    쓰는 쪽이 하나뿐이라 삭제 표시 없이 바로 지웁니다. 큰 데이터(blob)는 로컬 디스크에 저장합니다.
+    """
+
+    def __init__(self, blob_dir):
+        self.blob_dir = Path(blob_dir)
+        self._collections = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def put(self, scope, collection, key, value):
+        """값을 저장하고 (버전, 순서) 를 반환합니다. 새 항목은 컬렉션의 끝에 추가됩니다."""
+        with self._lock:
+            version = self._versions.get((scope, collection), 0) + 1
+            self._versions[(scope, collection)] = version
+            rows = self._collections.setdefault((scope, collection), {})
+            seq = rows[key][0] if key in rows else version
+            rows[key] = (seq, version, value)
+        return version, seq
+
+    def delete(self, scope, collection, keys):
+        with self._lock:
+            rows = self._collections.get((scope, collection), {})
+            for key in keys:
+                rows.pop(key, None)
+
+    def get_changes(self, scope, collection, since=0):
+        """since 이후 바뀐 (key, 순서, 값) 목록을 반환합니다.
+
+        (버전, 변경 목록, 전체 여부) 를 반환하며, 삭제된 항목의 값은 None입니다.
+        """
+        with self._lock:
+            version = self._versions.get((scope, collection), 0)
+            if since >= version:
+                return version, [], False
+            rows = self._collections.get((scope, collection), {})
+            changes = [
+                (key, seq, value)
+                for key, (seq, row_version, value) in rows.items()
+                if row_version > since
+            ]
+        return version, changes, False
+
+    def put_blob(self, scope, key, data):
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.blob_dir / f"{key}.json", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def get_blob(self, scope, key):
+        try:
+            with open(self.blob_dir / f"{key}.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except OSError:
+            return None
+
+    def delete_blob(self, scope, key):
+        (self.blob_dir / f"{key}.json").unlink(missing_ok=True)
+
+
+class SQLiteStateBackend:
+    """여러 프로세스/서버가 함께 쓰는 SQLite 파일 사용자 상태 저장소입니다.
+
+    모든 변경에 컬렉션별 버전을 붙이고 삭제는 표시만 남겨, 각 세션이 마지막으로 읽은
+    버전 이후의 변경만 가져갈 수 있게 합니다.
+    """
+
+    def __init__(self, path, tombstone_keep=STATE_TOMBSTONE_KEEP):
+        self.tombstone_keep = tombstone_keep
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=10
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            " scope TEXT NOT NULL,"
+            " collection TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " value TEXT,"
+            " PRIMARY KEY (scope, collection, key))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS state_version"
+            " ON state (scope, collection, version)"
+        )
+        # 삭제 표시를 정리한 버전. 이보다 오래된 사본은 전체를 다시 읽어야 함
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS collections ("
+            " scope TEXT NOT NULL,"
+            " collection TEXT NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " pruned_version INTEGER NOT NULL,"
+            " PRIMARY KEY (scope, collection))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " scope TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (scope, key))"
+        )
+        self._lock = threading.Lock()
+
+    def _next_version(self, scope, collection):
+        # BEGIN IMMEDIATE 안에서 호출되므로 프로세스 사이에서도 버전 순서와 커밋 순서가 같음
+        return self._conn.execute(
+            "INSERT INTO collections VALUES (?, ?, 1, 0)"
+            " ON CONFLICT (scope, collection) DO UPDATE SET version = version + 1"
+            " RETURNING version",
+            (scope, collection),
+        ).fetchone()[0]
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def put(self, scope, collection, key, value):
+        """값을 저장하고 (버전, 순서) 를 반환합니다. 새 항목은 컬렉션의 끝에 추가됩니다."""
+        value_json = json.dumps(value, ensure_ascii=False)
+        with self._transaction():
+            version = self._next_version(scope, collection)
+            seq = self._conn.execute(
+                "INSERT INTO state VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (scope, collection, key) DO UPDATE SET"
+                " seq = CASE WHEN value IS NULL THEN excluded.seq ELSE seq END,"
+                " version = excluded.version, value = excluded.value"
+                " RETURNING seq",
+                (scope, collection, key, version, version, value_json),
+            ).fetchone()[0]
+        return version, seq
+
+    def delete(self, scope, collection, keys):
+        if not keys:
+            return
+        with self._transaction():
+            version = self._next_version(scope, collection)
+            self._conn.executemany(
+                "UPDATE state SET value = NULL, version = ?"
+                " WHERE scope = ? AND collection = ? AND key = ? AND value IS NOT NULL",
+                [(version, scope, collection, key) for key in keys],
+            )
+            pruned_version = version - self.tombstone_keep
+            if pruned_version > 0:
+                self._conn.execute(
+                    "DELETE FROM state WHERE scope = ? AND collection = ?"
+                    " AND value IS NULL AND version <= ?",
+                    (scope, collection, pruned_version),
+                )
+                self._conn.execute(
+                    "UPDATE collections SET pruned_version = ?"
+                    " WHERE scope = ? AND collection = ?",
+                    (pruned_version, scope, collection),
+                )
+
+    def get_changes(self, scope, collection, since=0):
+        """since 이후 바뀐 (key, 순서, 값) 목록을 반환합니다.
+
+        (버전, 변경 목록, 전체 여부) 를 반환하며, 삭제된 항목의 값은 None입니다.
+        정리된 삭제 표시보다 오래된 since이면 전체 목록을 반환합니다.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, pruned_version FROM collections"
+                " WHERE scope = ? AND collection = ?",
+                (scope, collection),
+            ).fetchone()
+            version, pruned_version = row or (0, 0)
+            if since >= version:
+                return version, [], False
+            is_full = 0 < since < pruned_version
+            rows = self._conn.execute(
+                "SELECT key, seq, value, version FROM state"
+                " WHERE scope = ? AND collection = ? AND version > ?"
+                " ORDER BY version",
+                (scope, collection, 0 if is_full else since),
+            ).fetchall()
+        if rows:
+            version = max(version, rows[-1][3])
+        changes = [
+            (key, seq, None if value is None else json.loads(value))
+            for key, seq, value, _ in rows
+        ]
+        return version, changes, is_full
+
+    def put_blob(self, scope, key, data):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)",
+                (scope, key, json.dumps(data, ensure_ascii=False)),
+            )
+
+    def get_blob(self, scope, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM blobs WHERE scope = ? AND key = ?", (scope, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_blob(self, scope, key):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM blobs WHERE scope = ? AND key = ?", (scope, key)
+            )
+
+
+@st.cache_resource
+def get_sqlite_state_backend(path):
+    """프로세스 공용 SQLite 사용자 상태 저장소"""
+    return SQLiteStateBackend(path)
+
+
+def get_state_backend():
+    """secrets의 state-backend 설정에 따른 사용자 상태 저장소를 반환합니다.
+
+    기본값(memory)은 세션마다 따로 만들어 세션이 끝나면 함께 사라집니다.
+    """
+    if st.secrets.get("state-backend", "memory") == "sqlite":
+        return get_sqlite_state_backend(
+            str(st.secrets.get("state-backend-path", STATE_BACKEND_PATH))
+        )
+    if "state_backend" not in st.session_state:
+        st.session_state["state_backend"] = MemoryStateBackend(
+            get_response_log_spill_dir()
+        )
+    return st.session_state["state_backend"]
+
+
+class StateCollection:
+    """저장소의 컬렉션 하나를 세션 메모리에 복사해 둔 사본입니다.
+
+    읽기는 사본에서 하고 쓰기는 사본과 저장소에 함께 반영합니다.
+    sync()는 마지막으로 읽은 버전 이후의 변경만 저장소에서 가져옵니다.
+    값은 여러 곳에서 공유하므로 수정하지 않고 새 값으로 바꿔 넣어야 합니다.
+    """
+
+    def __init__(self, backend, scope, name):
+        self.backend = backend
+        self.scope = scope
+        self.name = name
+        self.version = 0
+        # 사본이 바뀔 때마다 증가 (이 사본으로 만든 인덱스의 갱신 여부 확인용)
+        self.revision = 0
+        self._items = {}
+
+    def sync(self):
+        version, changes, is_full = self.backend.get_changes(
+            self.scope, self.name, self.version
+        )
+        if is_full:
+            self._items = {}
+        for key, seq, value in changes:
+            if value is None:
+                self._items.pop(key, None)
+            else:
+                self._items[key] = (seq, value)
+        if changes or is_full:
+            # 다른 곳에서 추가한 항목이 섞일 수 있으므로 저장소의 순서로 정렬
+            self._items = dict(sorted(self._items.items(), key=lambda i: i[1][0]))
+            self.revision += 1
+        self.version = version
+
+    def put(self, key, value):
+        version, seq = self.backend.put(self.scope, self.name, key, value)
+        self._items[key] = (seq, value)
+        self._advance(version)
+
+    def append(self, value):
+        """고유한 key로 값을 추가하고 key를 반환합니다."""
+        key = uuid.uuid4().hex
+        self.put(key, value)
+        return key
+
+    def delete(self, keys):
+        keys = [key for key in keys if key in self._items]
+        if not keys:
+            return
+        self.backend.delete(self.scope, self.name, keys)
+        for key in keys:
+            del self._items[key]
+        self.revision += 1
+
+    def _advance(self, version):
+        # 그 사이에 다른 곳의 변경이 없었으면 다음 sync에서 방금 쓴 값을 다시 읽지 않음
+        if version == self.version + 1:
+            self.version = version
+        self.revision += 1
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        item = self._items.get(key)
+        return default if item is None else item[1]
+
+    def keys(self):
+        return self._items.keys()
+
+    def values(self):
+        return [value for _, value in self._items.values()]
+
+    def items(self):
+        return ((key, value) for key, (_, value) in self._items.items())
+
+
+class UserState:
+    """사용자 상태 저장소의 컬렉션 사본을 세션에 보관하고 실행마다 변경분만 동기화합니다."""
+
+    def __init__(self, backend, scope, state_key="user_state"):
+        self.backend = backend
+        self.scope = scope
+        cached = st.session_state.get(state_key)
+        if (
+            cached is None
+            or cached["backend"] is not backend
+            or cached["scope"] != scope
+        ):
+            cached = {"backend": backend, "scope": scope, "collections": {}}
+            st.session_state[state_key] = cached
+        self._collections = cached["collections"]
+        self._synced = set()
+
+    def collection(self, name):
+        """컬렉션 사본을 반환합니다. 이번 실행에서 처음 사용할 때 동기화합니다."""
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = StateCollection(self.backend, self.scope, name)
+            self._collections[name] = collection
+        if name not in self._synced:
+            collection.sync()
+            self._synced.add(name)
+        return collection
+
+
+class SelectionStore:
+    """키워드/뉴스 탭 체크박스의 on_change 콜백으로 갱신되는 선택 목록입니다.
+
+    세션 스테이트 전체를 훑지 않고, 사용자 상태 저장소에 선택한 순서대로 보관합니다.
+    """
+
+    KEYWORD = "keyword"  # viewKeyMap.keywordKeyMap 의 키
+    DOCUMENT = "document"  # viewKeyMap.documentKeyMap 의 키
+
+    def __init__(self, state):
+        self._selected = {
+            kind: state.collection(f"selection:{kind}")
+            for kind in (self.KEYWORD, self.DOCUMENT)
+        }
+
+    def on_change(self, kind, view_key):
+        """체크박스 값이 바뀌면 선택 목록에 반영합니다."""
+        self.set_selected(kind, view_key, st.session_state.get(view_key, False))
+
+    def set_selected(self, kind, view_key, is_selected):
+        selected = self._selected[kind]
+        if is_selected and view_key not in selected:
+            selected.put(view_key, True)
+        elif not is_selected:
+            selected.delete([view_key])
+
+    def is_selected(self, view_key):
+        return any(view_key in selected for selected in self._selected.values())
+
+    def get_keys(self, kind=None):
+        """선택한 순서대로 view key 목록을 반환합니다."""
+        if kind is not None:
+            return list(self._selected[kind].keys())
+        return [key for selected in self._selected.values() for key in selected.keys()]
+
+
+def extract_result_keywords(data):
+    """searchKeyword 응답의 results에서 키워드 목록을 추출합니다."""
+    keywords = set()
+    if not isinstance(data, dict) or "results" not in data:
+        return keywords
+    for item in filter(
+        lambda x: isinstance(x[1]["keywords"], list) and len(x[1]["keywords"]) > 0,
+        data["results"].items(),
+    ):
+        keywords.update(item[1]["keywords"])
+    return keywords
+
+
+class ResponseLogStore:
+    """사용자의 응답 로그를 개수와 대략적인 크기로 제한해 보관합니다.
+
+    로그는 사용자 상태 저장소의 response_logs 컬렉션에 두고, 큰 응답은 blob으로 따로 저장해
+    요약만 남깁니다. search_period와 type별 인덱스로 전체 로그를 훑지 않고 조회합니다.
+    """
+
+    def __init__(
+        self,
+        state,
+        max_entries=RESPONSE_LOG_MAX_ENTRIES,
+        max_bytes=RESPONSE_LOG_MAX_BYTES,
+        spill_bytes=RESPONSE_LOG_SPILL_BYTES,
+    ):
+        self.backend = state.backend
+        self.scope = state.scope
+        self.entries = state.collection("response_logs")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_bytes = spill_bytes
+        self._indexed_revision = None
+        self.refresh()
+
+    def refresh(self):
+        """다른 세션이나 서버가 로그를 바꿨으면 인덱스를 다시 만듭니다."""
+        if self._indexed_revision == self.entries.revision:
+            return
+        self._by_period = {}
+        self._by_type = {}
+        self._bytes = 0
+        for entry_id, entry in self.entries.items():
+            self._index(entry_id, entry)
+        self._indexed_revision = self.entries.revision
+
+    def add(self, entry):
+        entry = dict(entry)
+        entry_id = uuid.uuid4().hex
+
+        if "data" in entry:
+            data = entry["data"]
+            if entry.get("type") == "keyword-search":
+                entry["keywords"] = sorted(extract_result_keywords(data))
+            size = len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+            entry["data_size"] = size
+            if size > self.spill_bytes:
+                self.backend.put_blob(self.scope, entry_id, data)
+                entry["data_blob"] = entry_id
+                del entry["data"]
+        entry["memory_size"] = len(json.dumps(entry, ensure_ascii=False))
+
+        self.entries.put(entry_id, entry)
+        self._index(entry_id, entry)
+        self._evict()
+        self._indexed_revision = self.entries.revision
+
+    def _index(self, entry_id, entry):
+        self._bytes += entry["memory_size"]
+        for index, value in (
+            (self._by_period, entry.get("search_period")),
+            (self._by_type, entry.get("type")),
+        ):
+            if value is not None:
+                index.setdefault(value, {})[entry_id] = None
+
+    def get_entries(self, search_period=None, log_type=None):
+        """조건에 맞는 로그를 오래된 순서로 반환합니다 (blob으로 옮긴 응답은 제외)."""
+        entry_ids = None
+        for index, value in (
+            (self._by_period, search_period),
+            (self._by_type, log_type),
+        ):
+            if value is None:
+                continue
+            ids = index.get(value, {})
+            entry_ids = ids if entry_ids is None else [i for i in entry_ids if i in ids]
+        if entry_ids is None:
+            return self.entries.values()
+        return [self.entries.get(entry_id) for entry_id in entry_ids]
+
+    def get_data(self, entry):
+        """로그의 응답 데이터를 반환합니다. blob으로 옮긴 응답은 저장소에서 읽습니다."""
+        if "data" in entry:
+            return entry["data"]
+        if "data_blob" not in entry:
+            return None
+        return self.backend.get_blob(self.scope, entry["data_blob"])
+
+    def _evict(self):
+        while len(self.entries) and (
+            len(self.entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            entry_id, entry = next(self.entries.items())
+            self.entries.delete([entry_id])
+            self._bytes -= entry["memory_size"]
+            for index, value in (
+                (self._by_period, entry.get("search_period")),
+                (self._by_type, entry.get("type")),
+            ):
+                if value in index:
+                    index[value].pop(entry_id, None)
+                    if not index[value]:
+                        del index[value]
+            if "data_blob" in entry:
+                self.backend.delete_blob(self.scope, entry["data_blob"])
+
+
+class SpillFileSweeper:
+    """디스크에 옮긴 응답 로그 파일을 주기적으로 정리합니다.
+
+    MemoryStateBackend의 blob 파일은 세션이 끝나도 남으므로, max_age보다 오래된 파일을 지우고
+    전체 크기가 max_total_bytes를 넘으면 오래된 파일부터 지웁니다.
+    """
+
+    def __init__(
+        self,
+        spill_dir,
+        max_age=RESPONSE_LOG_SPILL_MAX_AGE,
+        max_total_bytes=RESPONSE_LOG_SPILL_MAX_TOTAL_BYTES,
+        interval=RESPONSE_LOG_SPILL_SWEEP_INTERVAL,
+    ):
+        self.spill_dir = Path(spill_dir)
+        self.max_age = max_age
+        self.max_total_bytes = max_total_bytes
+        self.interval = interval
+
+    def start(self):
+        self.sweep()
+        threading.Thread(
+            target=self._loop, name="response-log-sweeper", daemon=True
+        ).start()
+        return self
+
+    def sweep(self):
+        """정리 기준에 걸린 파일을 지우고 지운 파일 수를 반환합니다."""
+        files = []
+        for path in self.spill_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                # 다른 세션이 방금 지운 파일
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort(key=lambda file: file[0])
+        total_bytes = sum(size for _, size, _ in files)
+        expired_at = time.time() - self.max_age
+        removed = 0
+        for mtime, size, path in files:
+            if mtime >= expired_at and total_bytes <= self.max_total_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sweep()
+            except OSError:
+                pass
+
+
+@st.cache_resource
+def get_response_log_spill_dir():
+    """응답 로그를 옮겨 둘 디렉터리. 오래되었거나 전체 크기를 넘은 파일을 주기적으로 정리합니다."""
+    return SpillFileSweeper(CACHE_DIR / "response_logs").start().spill_dir
+
+
 class KeywordLogs:
-    def __init__(self, user_settings=None, app_config=None):
+    def __init__(self, context, user_settings=None, app_config=None):
+        self.context = context
         self.log_key = "response_logs"
         self.settings_key = "user_settings"
-        self.app_config = app_config["data"]
-        # 세션 스테이트 초기화
-        if self.log_key not in st.session_state:
-            st.session_state[self.log_key] = []
+        self.app_config = app_config["data"] if app_config else {}
+        self.state = context.state
+        self.selection = SelectionStore(self.state)
+        self.searched_periods = self.state.collection("searched_periods")
+        self.keywords_report_made = self.state.collection("keywords_report_made")
+        # 인덱스를 실행마다 다시 만들지 않도록 로그 저장소는 세션에 보관
+        log_store = st.session_state.get(self.log_key)
+        if not (
+            isinstance(log_store, ResponseLogStore)
+            and log_store.entries is self.state.collection("response_logs")
+        ):
+            log_store = ResponseLogStore(self.state)
+            st.session_state[self.log_key] = log_store
+        log_store.refresh()
+        self.log_store = log_store
 
         # 사용자 설정 저장
+        self.set_user_settings(user_settings)
+
+    def set_user_settings(self, user_settings):
         if user_settings:
             st.session_state[self.settings_key] = user_settings["data"]["viewSettings"]
 
+    def refresh_user_settings(self):
+        """캐시된 사용자 설정을 다시 읽어 반영합니다.
+
+        만료된 값도 사용하므로 백엔드가 느려도 실행 시간 예산을 넘기지 않습니다.
+        캐시에 아직 없으면 백엔드를 기다리지 않고 현재 설정을 그대로 둡니다.
+        """
+        self.set_user_settings(self.context.db_handler.peek_settings())
+
     def get_app_title(self):
-        return self.app_config["title"]
+        return self.app_config.get("title", DEFAULT_APP_TITLE)
 
     def get_settings(self):
         """설정 목록을 반환합니다."""
@@ -334,6 +1169,19 @@ class KeywordLogs:
             None,
         )
 
+    def get_selected_sources(self, settings_type: SettingsType):
+        """설정에서 선택된 소스의 alias 목록을 반환합니다.
+
+        alias가 없는 소스가 선택되어 있으면 검색할 소스를 특정할 수 없으므로 None을 반환합니다.
+        """
+        setting = self.get_setting(settings_type) or {}
+        aliases = [
+            source.get("alias")
+            for source in setting.get("sources", [])
+            if source.get("isSelect")
+        ]
+        return None if None in aliases else aliases
+
     def get_date_select_and_option(self):
         keyword_setting = self.get_setting(SettingsType.KEYWORD)
         date_option_key = keyword_setting["dateOptionKey"]
@@ -357,47 +1205,43 @@ class KeywordLogs:
         else:
             log_entry["data"] = data
 
-        st.session_state[self.log_key].append(log_entry)
+        self.log_store.add(log_entry)
 
     def add_searched_period(self, period):
-        if "searched_periods" not in st.session_state:
-            st.session_state["searched_periods"] = []
-        st.session_state["searched_periods"].append(period)
+        self.searched_periods.append(period)
 
     def add_keywords_report_made(self, keywords):
-        if "keywords_report_made" not in st.session_state:
-            st.session_state["keywords_report_made"] = []
-        st.session_state["keywords_report_made"].append(keywords)
+        self.keywords_report_made.append(keywords)
 
     def get_logs(self):
-        return st.session_state.get(self.log_key, [])
+        return self.log_store.get_entries()
 
     def get_all_keywords(self, search_period=None):
         all_keywords = set()
-        for log in self.get_logs():
-            if search_period and log.get("search_period") != search_period:
-                continue
-
-            if not log.get("is_error") and "data" in log and "results" in log["data"]:
-                for item in filter(
-                    lambda x: isinstance(x[1]["keywords"], list)
-                    and len(x[1]["keywords"]) > 0,
-                    log["data"]["results"].items(),
-                ):
-                    all_keywords.update(item[1]["keywords"])
+        # 키워드는 로그를 추가할 때 미리 추출해 두므로 응답 데이터를 다시 읽지 않음
+        for log in self.log_store.get_entries(search_period=search_period or None):
+            if not log.get("is_error"):
+                all_keywords.update(log.get("keywords", []))
         return sorted(all_keywords)
 
     def get_selected_keywords(self):
         """현재 선택된 모든 키워드를 반환합니다."""
         selected = []
-        for key, value in st.session_state.items():
-            if key.startswith("VIEW#DATE#") and "#KEYWORD#" in key and value:
+        for key in self.selection.get_keys():
+            if "#KEYWORD#" in key:
                 # VIEW#DATE#2025-01-23#KEYWORD#artificial_intelligence_in_construction 형식에서
                 # artificial_intelligence_in_construction 부분만 추출
                 keyword = key.split("#KEYWORD#")[1]
                 selected.append(keyword)
         return sorted(selected)
 
+    def get_selected_items(self, history):
+        """선택한 항목으로 보고서에 넣을 (키워드 목록, 뉴스 목록)을 중복 없이 반환합니다."""
+        return history.resolve_selection(
+            self.selection.get_keys(SelectionStore.KEYWORD),
+            self.selection.get_keys(SelectionStore.DOCUMENT),
+        )
+
     def is_keyword_selected(self, keyword: str):
         """해당 키워드가 선택되었는지 확인합니다."""
         return st.session_state.get(keyword, False)
@@ -409,17 +1253,16 @@ class KeywordLogs:
                 del st.session_state[key]
 
     def get_searched_periods(self):
-        return st.session_state.get("searched_periods", [])
+        return self.searched_periods.values()
 
     def get_reports(self):
-        return list(
-            filter(
-                lambda x: x.get("type") == "report-make", st.session_state[self.log_key]
-            )
-        )
+        return [
+            {**log, "data": self.log_store.get_data(log)}
+            for log in self.log_store.get_entries(log_type="report-make")
+        ]
 
     def get_keywords_report_made(self):
-        return st.session_state.get("keywords_report_made", [])
+        return self.keywords_report_made.values()
 
 
 class ResponseLogger:
@@ -448,87 +1291,2108 @@ class ResponseLogger:
                     # st.json(log["data"])
 
 
+class PerformancePanel:
+    def __init__(self, span_metrics):
+        self.span_metrics = span_metrics
+
+    def show(self, rerun_spans):
+        """이번 실행의 구간별 소요 시간과 최근 집계를 사이드바에 표시합니다."""
+        with st.sidebar.expander("Performance", expanded=False):
+            st.write("이번 실행")
+            st.dataframe(
+                [
+                    {"구간": name, "ms": round(elapsed * 1000, 1)}
+                    for name, elapsed in rerun_spans
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.write("최근 집계")
+            st.dataframe(
+                [
+                    {"구간": name, **stats}
+                    for name, stats in self.span_metrics.get_stats().items()
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.write("백엔드 응답 시간")
+            latency_stats = get_http_transport().get_latency_stats()
+            st.dataframe(
+                [
+                    {"엔드포인트": endpoint, **stats}
+                    for endpoint, stats in latency_stats.items()
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.write("캐시")
+            st.json(
+                {
+                    "search": get_search_cache().get_stats(),
+                    "keywords_searched": get_keywords_searched_cache().get_stats(),
+                    "report_first_chunk": get_report_job_manager().get_first_chunk_stats(),
+                    "circuit_breaker": get_http_transport().circuit_breaker.get_status(),
+                    "precompute": (
+                        get_precompute_scheduler().get_status()
+                        if st.secrets.get("precompute-scheduler", False)
+                        else None
+                    ),
+                },
+                expanded=False,
+            )
+
+
 class KeywordResultDisplay:
+    def __init__(self, context):
+        self.keyword_logs = context.keyword_logs
+
     def show_selected_keywords(self, selected_keywords):
         st.write(", ".join(selected_keywords))
 
-    def show_results(self, search_period: str):
-        # 검색 결과 표시
-        with st.expander(f"🔍 검색 결과 - {search_period}", expanded=True):
-            for keyword in keyword_logs.get_all_keywords(search_period):
+    def show_results(self, search_period: str, results=()):
+        """검색 결과 키워드를 체크박스로 표시합니다.
+
+        results에 검색 결과를 끝나는 대로 내보내는 iterable을 주면, 결과가 올 때마다
+        새로 나온 키워드의 체크박스를 이어서 추가합니다.
+        """
+        shown = set()
+
+        def show_keywords(keywords):
+            for keyword in sorted(set(keywords) - shown):
                 st.checkbox(
                     keyword,
-                    value=keyword_logs.is_keyword_selected(
+                    value=self.keyword_logs.is_keyword_selected(
                         f"sk_{search_period}_{keyword}"
                     ),
                     key=f"sk_{search_period}_{keyword}",
                 )
+                shown.add(keyword)
+
+        # 검색 결과 표시
+        with st.expander(f"🔍 검색 결과 - {search_period}", expanded=True):
+            show_keywords(self.keyword_logs.get_all_keywords(search_period))
+            for result in results:
+                show_keywords(extract_result_keywords(result))
             if st.button(
                 "키워드 선택 취소", key=f"clear_selected_keywords_{search_period}"
             ):
-                keyword_logs.clear_selected_keywords(search_period)
+                self.keyword_logs.clear_selected_keywords(search_period)
                 st.rerun()
 
 
-class APIManager:
-    def __init__(self):
-        self.keyword_finder_url = keyword_finder_url
-        self.report_maker_url = report_maker_url
-        self.app_manager_url = app_manager_url
+# 현재 실행(rerun) 중에 기록된 (구간, 소요 시간) 목록. 실행 밖에서는 None
+current_rerun_spans = contextvars.ContextVar("current_rerun_spans", default=None)
 
-    def _is_localhost(self):
-        is_local = st.query_params.get("localhost", "")
-        return bool(is_local)
 
-    async def _get_dummy_data(self):
-        dummy_file = Path(__file__).parent / "dummy.json"
-        with open(dummy_file, "r", encoding="utf-8") as f:
-            dummy_data = json.load(f)
-        await asyncio.sleep(1)
-        return dummy_data
+class SpanMetrics:
+    """화면 구간과 백엔드 호출의 소요 시간을 모든 세션에 걸쳐 집계합니다.
 
-    async def _get_dummy_report(self):
-        dummy_file = Path(__file__).parent / "dummy-report.json"
-        with open(dummy_file, "r", encoding="utf-8") as f:
-            dummy_data = json.load(f)
-        await asyncio.sleep(1)
-        return dummy_data
+    구간별 최근 window개로 p50/p95를 계산하며, 현재 실행 중인 rerun이 있으면
+    그 실행의 구간 목록에도 기록합니다.
+    """
 
-    def search(
+    def __init__(
         self,
-        search_keyword_type: SearchKeywordType,
-        start_date,
-        period_days,
+        window=METRICS_WINDOW,
+        export_dir=METRICS_EXPORT_DIR,
+        export_interval=METRICS_EXPORT_INTERVAL,
     ):
-        """
-        키워드 검색을 실행하고 결과를 반환합니다.
-        """
-        try:
-            response = requests.post(
-                f"{self.app_manager_url}/searchKeyword",
-                json={
-                    "user_id": user_id,
-                    "search_keyword_type": search_keyword_type.value,
-                    "start_date": start_date,
-                    "period_days": period_days,
-                },
+        self.window = window
+        self.export_dir = Path(export_dir)
+        self.export_interval = export_interval
+        self._spans = {}
+        self._exported_at = 0
+        self._lock = threading.Lock()
+
+    def record(self, name, elapsed):
+        with self._lock:
+            stats = self._spans.setdefault(
+                name, {"count": 0, "sum": 0.0, "recent": deque(maxlen=self.window)}
             )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            raise Exception(f"API 요청 실패: {str(e)}")
+            stats["count"] += 1
+            stats["sum"] += elapsed
+            stats["recent"].append(elapsed)
+        rerun_spans = current_rerun_spans.get()
+        if rerun_spans is not None:
+            rerun_spans.append((name, elapsed))
 
-    def make_report(self, keywords, search_keyword_type: SearchKeywordType):
-        if self._is_localhost():
-            result = asyncio.run(self._get_dummy_report())
-            return result
-        else:
-            try:
-                response = requests.post(
-                    f"{self.app_manager_url}/makeReport",
-                    json={
-                        "user_id": user_id,
-                        "search_keyword_type": search_keyword_type.value,
+    @contextmanager
+    def span(self, name):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    @contextmanager
+    def rerun(self):
+        """스크립트 한 번의 실행을 rerun 구간으로 기록하고, 그 실행의 구간 목록을 제공합니다."""
+        rerun_spans = []
+        token = current_rerun_spans.set(rerun_spans)
+        started_at = time.perf_counter()
+        try:
+            yield rerun_spans
+        finally:
+            current_rerun_spans.reset(token)
+            elapsed = time.perf_counter() - started_at
+            self.record("rerun", elapsed)
+            rerun_spans.append(("rerun", elapsed))
+            self.export()
+
+    def get_stats(self):
+        """구간별 호출 수와 최근 소요 시간(ms) 통계를 반환합니다."""
+        with self._lock:
+            snapshot = {
+                name: (stats["count"], sorted(stats["recent"]))
+                for name, stats in self._spans.items()
+            }
+        return {
+            name: {
+                "count": count,
+                "p50_ms": round(recent[len(recent) // 2] * 1000, 1),
+                "p95_ms": round(recent[int(len(recent) * 0.95)] * 1000, 1),
+                "max_ms": round(recent[-1] * 1000, 1),
+            }
+            for name, (count, recent) in sorted(snapshot.items())
+        }
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식 (summary) 으로 변환합니다."""
+        with self._lock:
+            snapshot = {
+                name: (stats["count"], stats["sum"], sorted(stats["recent"]))
+                for name, stats in self._spans.items()
+            }
+        lines = [
+            "# HELP app_span_seconds Time spent in a render section or backend call.",
+            "# TYPE app_span_seconds summary",
+        ]
+        for name, (count, total, recent) in sorted(snapshot.items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for quantile in (0.5, 0.95):
+                value = recent[min(int(len(recent) * quantile), len(recent) - 1)]
+                lines.append(
+                    f'app_span_seconds{{span="{label}",quantile="{quantile}"}} {value:.6f}'
+                )
+            lines.append(f'app_span_seconds_sum{{span="{label}"}} {total:.6f}')
+            lines.append(f'app_span_seconds_count{{span="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, force=False):
+        """집계를 metrics.json, metrics.prom 파일로 저장합니다 (export_interval초마다 한 번)."""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._exported_at < self.export_interval:
+                return
+            self._exported_at = now
+        try:
+            self.export_dir.mkdir(parents=True, exist_ok=True)
+            files = {
+                "metrics.json": json.dumps(
+                    {"updated_at": now, "spans": self.get_stats()},
+                    ensure_ascii=False,
+                    indent=2,
+                ),
+                "metrics.prom": self.to_prometheus(),
+            }
+            for file_name, content in files.items():
+                # 읽는 쪽이 쓰는 중인 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+                tmp_path = self.export_dir / f"{file_name}.tmp"
+                tmp_path.write_text(content, encoding="utf-8")
+                tmp_path.replace(self.export_dir / file_name)
+        except OSError:
+            # 통계 저장 실패로 화면이 실패하지 않도록 무시
+            pass
+
+
+def start_metrics_server(span_metrics, host, port):
+    """/metrics (Prometheus 텍스트) 와 /metrics.json 을 제공하는 HTTP 서버를 시작합니다."""
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == "/metrics":
+                body = span_metrics.to_prometheus()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/metrics.json":
+                body = json.dumps(span_metrics.get_stats(), ensure_ascii=False)
+                content_type = "application/json; charset=utf-8"
+            else:
+                self.send_error(404)
+                return
+            payload = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    return server
+
+
+@st.cache_resource
+def get_span_metrics():
+    """프로세스 공용 소요 시간 집계. secrets의 metrics-port가 있으면 metrics 서버도 시작"""
+    span_metrics = SpanMetrics()
+    metrics_port = st.secrets.get("metrics-port")
+    if metrics_port:
+        try:
+            start_metrics_server(
+                span_metrics,
+                st.secrets.get("metrics-host", "127.0.0.1"),
+                int(metrics_port),
+            )
+        except OSError as e:
+            st.warning(f"metrics 서버 시작 실패: {str(e)}")
+    return span_metrics
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않았을 때 발생합니다."""
+
+    def __init__(self, endpoint, remaining):
+        super().__init__(
+            f"{endpoint} 호출이 연속으로 실패해 {remaining:.0f}초 동안 요청하지 않습니다."
+        )
+        self.endpoint = endpoint
+
+
+class CircuitBreaker:
+    """엔드포인트별 연속 실패를 세어 백엔드가 응답하지 않으면 잠시 요청을 막습니다.
+
+    closed: 요청을 보냄. 연속 failure_threshold번 실패하면 open으로 바뀜
+    open: cooldown초 동안 요청을 보내지 않고 CircuitOpenError를 발생시킴
+    half-open: cooldown이 지나면 요청 하나만 보내 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        failure_threshold=CIRCUIT_BREAKER_FAILURES,
+        cooldown=CIRCUIT_BREAKER_COOLDOWN,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _get_state(self, endpoint):
+        return self._states.setdefault(
+            endpoint,
+            {
+                "failures": 0,
+                "opened_at": None,
+                "probing": False,
+                "opens": 0,
+                "rejected": 0,
+            },
+        )
+
+    def before_request(self, endpoint):
+        """요청을 보내도 되는지 확인합니다. 막혀 있으면 CircuitOpenError를 발생시킵니다."""
+        with self._lock:
+            state = self._get_state(endpoint)
+            if state["opened_at"] is None:
+                return
+            remaining = state["opened_at"] + self.cooldown - time.monotonic()
+            if remaining <= 0 and not state["probing"]:
+                state["probing"] = True
+                return
+            state["rejected"] += 1
+        raise CircuitOpenError(endpoint, max(remaining, 0))
+
+    def record(self, endpoint, error=False):
+        with self._lock:
+            state = self._get_state(endpoint)
+            if not error:
+                state.update(failures=0, opened_at=None, probing=False)
+                return
+            state["failures"] += 1
+            if state["probing"] or (
+                state["opened_at"] is None
+                and state["failures"] >= self.failure_threshold
+            ):
+                state.update(opened_at=time.monotonic(), probing=False)
+                state["opens"] += 1
+
+    def get_status(self):
+        """엔드포인트별 상태(closed/open/half-open), 연속 실패 수, 열린 횟수, 막은 요청 수"""
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for endpoint, state in self._states.items():
+                if state["opened_at"] is None:
+                    status = "closed"
+                elif state["probing"] or now - state["opened_at"] >= self.cooldown:
+                    status = "half-open"
+                else:
+                    status = "open"
+                result[endpoint] = {
+                    "state": status,
+                    "failures": state["failures"],
+                    "opens": state["opens"],
+                    "rejected": state["rejected"],
+                }
+            return result
+
+
+class HTTPTransport:
+    """모든 백엔드 호출이 공유하는 keep-alive 커넥션 풀입니다.
+
+    엔드포인트별 타임아웃을 적용하고, 멱등한 GET 요청만 지터를 넣은
+    지수 백오프로 재시도하며, 엔드포인트별 응답 시간을 기록합니다.
+    연속으로 실패하는 엔드포인트는 서킷 브레이커로 잠시 요청 없이 바로 실패시킵니다.
+    """
+
+    def __init__(
+        self,
+        timeouts=None,
+        pool_size=HTTP_POOL_SIZE,
+        span_metrics=None,
+        circuit_breaker=None,
+    ):
+        self.timeouts = {**HTTP_TIMEOUTS, **(timeouts or {})}
+        self.span_metrics = span_metrics
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_endpoint(url):
+        """https://host/prefix/getSettings -> /getSettings"""
+        return "/" + urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+    def request(self, method, url, **kwargs):
+        endpoint = self.get_endpoint(url)
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, DEFAULT_HTTP_TIMEOUT))
+        attempts = HTTP_GET_RETRIES + 1 if method == "GET" else 1
+
+        for attempt in range(attempts):
+            self.circuit_breaker.before_request(endpoint)
+            started_at = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except Exception as e:
+                # 어떤 오류든 실패로 기록해야 half-open 시험 요청이 끝나지 않은 채 남지 않음
+                self._record(endpoint, time.perf_counter() - started_at, error=True)
+                if attempt == attempts - 1 or not isinstance(
+                    e, (requests.ConnectionError, requests.Timeout)
+                ):
+                    raise
+            else:
+                retryable = response.status_code in HTTP_RETRY_STATUSES
+                self._record(
+                    endpoint, time.perf_counter() - started_at, error=retryable
+                )
+                if not retryable or attempt == attempts - 1:
+                    return response
+                # 재시도하기 전에 응답을 닫아 커넥션을 풀에 돌려줌
+                response.close()
+            # full jitter: 동시에 실패한 요청들이 같은 시점에 몰리지 않도록 분산
+            time.sleep(random.uniform(0, HTTP_RETRY_BACKOFF * 2**attempt))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def _record(self, endpoint, elapsed, error=False):
+        with self._lock:
+            stats = self._latencies.setdefault(
+                endpoint, {"count": 0, "errors": 0, "recent": deque(maxlen=200)}
+            )
+            stats["count"] += 1
+            stats["errors"] += int(error)
+            stats["recent"].append(elapsed)
+        self.circuit_breaker.record(endpoint, error)
+        if self.span_metrics is not None:
+            self.span_metrics.record(f"backend:{endpoint}", elapsed)
+
+    def get_latency_stats(self):
+        """엔드포인트별 호출 수, 오류 수, 최근 응답 시간(ms) 통계를 반환합니다."""
+        with self._lock:
+            snapshot = {
+                endpoint: (stats["count"], stats["errors"], sorted(stats["recent"]))
+                for endpoint, stats in self._latencies.items()
+            }
+        result = {}
+        for endpoint, (count, errors, recent) in snapshot.items():
+            result[endpoint] = {
+                "count": count,
+                "errors": errors,
+                "p50_ms": round(recent[len(recent) // 2] * 1000, 1),
+                "p95_ms": round(recent[int(len(recent) * 0.95)] * 1000, 1),
+                "max_ms": round(recent[-1] * 1000, 1),
+            }
+        return result
+
+
+@st.cache_resource
+def get_http_transport():
+    """프로세스 공용 HTTP 전송 계층"""
+    timeouts = {
+        endpoint: tuple(timeout)
+        for endpoint, timeout in st.secrets.get("http-timeouts", {}).items()
+    }
+    return HTTPTransport(timeouts, span_metrics=get_span_metrics())
+
+
+class TTLCache:
+    """항목별 만료 시간을 갖는 스레드 안전한 캐시입니다.
+
+    keep_stale이면 만료된 항목을 지우지 않고 남겨 두어, 백엔드가 느리거나
+    실패할 때 peek으로 마지막으로 받은 값을 대신 사용할 수 있습니다.
+    """
+
+    def __init__(self, ttl, keep_stale=False):
+        self.ttl = ttl
+        self.keep_stale = keep_stale
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """만료되지 않은 값을 반환합니다. 없거나 만료되었으면 default를 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                if not self.keep_stale:
+                    del self._entries[key]
+                return default
+            return value
+
+    def peek(self, key):
+        """만료 여부와 관계없이 현재 저장된 값을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+
+    def patch(self, key, func):
+        """캐시된 값을 func로 직접 수정합니다. func가 False를 반환하면 항목을 무효화합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            if not func(entry[1]):
+                del self._entries[key]
+                return False
+            return True
+
+    def invalidate(self, key=None):
+        """key에 해당하는 항목을 지웁니다. key가 없으면 전체를 지웁니다."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class SingleFlight:
+    """같은 key에 대한 동시 호출을 한 번의 실행으로 합칩니다."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """func() 결과와 다른 호출의 결과를 공유했는지 여부를 반환합니다."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+
+        if not is_leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"], True
+
+        try:
+            call["result"] = func()
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+        return call["result"], False
+
+
+class StaleWhileRevalidateCache:
+    """만료된 값은 즉시 반환하고 백그라운드에서 한 번만 갱신하는 캐시입니다.
+
+    값이 없을 때의 동시 요청은 SingleFlight로 한 번의 fetch로 합칩니다.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._refreshing = set()
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    def get(self, key, fetch):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                fetched_at, value = entry
+                if time.monotonic() - fetched_at < self.ttl:
+                    self._stats["hits"] += 1
+                    return value
+                self._stats["stale_hits"] += 1
+                start_refresh = key not in self._refreshing
+                if start_refresh:
+                    self._refreshing.add(key)
+
+        if entry is not None:
+            if start_refresh:
+                threading.Thread(
+                    target=self._refresh, args=(key, fetch), daemon=True
+                ).start()
+            return value
+
+        value, shared = self._flight.do(key, lambda: self._load(key, fetch))
+        with self._lock:
+            self._stats["coalesced" if shared else "misses"] += 1
+        return value
+
+    def _load(self, key, fetch):
+        value = fetch()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def _refresh(self, key, fetch):
+        try:
+            self._flight.do(key, lambda: self._load(key, fetch))
+            with self._lock:
+                self._stats["refreshes"] += 1
+        except Exception:
+            # 갱신에 실패하면 기존 값을 계속 사용하고 다음 요청 때 다시 시도
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def refresh(self, key, fetch):
+        """만료 여부와 관계없이 지금 다시 가져와 저장하고 반환합니다."""
+        value, _ = self._flight.do(key, lambda: self._load(key, fetch))
+        with self._lock:
+            self._stats["refreshes"] += 1
+        return value
+
+    def peek(self, key):
+        """만료 여부와 관계없이 현재 저장된 값을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self):
+        """hit/miss/refresh 카운터를 반환합니다."""
+        with self._lock:
+            return dict(self._stats)
+
+
+@st.cache_resource
+def get_fan_out_executor():
+    """여러 세션이 공유하는 백엔드 동시 호출용 스레드 풀"""
+    return ThreadPoolExecutor(max_workers=16, thread_name_prefix="fan-out")
+
+
+def fetch_concurrently(calls, deadline):
+    """서로 독립적인 호출들을 동시에 실행하고 deadline(초) 안에 끝난 결과를 모읍니다.
+
+    calls는 {이름: 함수} 형태이며, ({이름: 결과}, {이름: 오류 메시지}, {이름: 끝나지 않은 future})를
+    반환합니다. 함수는 워커 스레드에서 실행되므로 st.* 를 호출하면 안 됩니다.
+    """
+    executor = get_fan_out_executor()
+    # 워커 스레드의 백엔드 호출도 현재 실행의 구간으로 기록되도록 context를 전달
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, func)
+        for name, func in calls.items()
+    }
+    wait(futures.values(), timeout=deadline)
+
+    results, errors, pending = {}, {}, {}
+    for name, future in futures.items():
+        if not future.done():
+            # 늦은 호출은 기다리지 않음 (캐시를 채우는 호출은 백그라운드에서 계속 진행)
+            errors[name] = f"{deadline}초 안에 응답이 없습니다."
+            pending[name] = future
+        elif future.exception() is not None:
+            errors[name] = str(future.exception())
+        else:
+            results[name] = future.result()
+    return results, errors, pending
+
+
+def rerun_when_fetched(futures):
+    """늦게 끝난 호출이 캐시를 채웠으면 전체를 다시 실행해 최신 값으로 다시 그립니다.
+
+    run_every 프래그먼트로 실행합니다. 모두 실패로 끝났으면 다시 실행하지 않고
+    다음 실행(사용자 조작) 때 다시 조회합니다.
+    """
+    if all(future.done() for future in futures) and any(
+        future.exception() is None for future in futures
+    ):
+        st.rerun()
+
+
+class CoalescingCache:
+    """TTL 캐시에 없는 값은 같은 key의 동시 요청을 한 번의 호출로 합쳐서 가져옵니다.
+
+    실패한 호출은 캐시하지 않으며, 캐시와 합치기로 아낀 호출 수를 기록합니다.
+    """
+
+    def __init__(self, ttl):
+        self._cache = TTLCache(ttl)
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def get_or_fetch(self, key, fetch):
+        value = self._cache.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+
+        def load():
+            # 앞선 호출이 방금 끝나 캐시를 채웠을 수 있음
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            fetched = fetch()
+            self._cache.set(key, fetched)
+            return fetched
+
+        value, shared = self._flight.do(key, load)
+        self._count("coalesced" if shared else "misses")
+        return value
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_stats(self):
+        """hits/misses/coalesced 와 아낀 호출 수(saved)를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["saved"] = stats["hits"] + stats["coalesced"]
+        return stats
+
+
+@st.cache_resource
+def get_search_cache():
+    """수동 키워드 검색 결과 캐시 (프로세스 공용, 모든 세션이 공유)"""
+    return CoalescingCache(SEARCH_CACHE_TTL)
+
+
+@st.cache_resource
+def get_search_source_support():
+    """백엔드가 검색 요청의 sources를 지원하는지 여부 (프로세스 공용, 확인 전에는 None)"""
+    return {"supported": None}
+
+
+@st.cache_resource
+def get_bulk_settings_support():
+    """백엔드가 설정 일괄 저장(/updateSettings)을 지원하는지 여부 (프로세스 공용, 확인 전에는 None)"""
+    return {"supported": None}
+
+
+@st.cache_resource
+def get_settings_cache():
+    """사용자별 설정 캐시 (프로세스 공용)"""
+    return TTLCache(SETTINGS_CACHE_TTL, keep_stale=True)
+
+
+@st.cache_resource
+def get_app_config_cache():
+    """앱 설정 캐시 (프로세스 공용)"""
+    return TTLCache(APP_CONFIG_CACHE_TTL, keep_stale=True)
+
+
+@st.cache_resource
+def get_keywords_searched_cache():
+    """getKeywordsSearched 응답 캐시 (프로세스 공용, 모든 세션이 공유)"""
+    return StaleWhileRevalidateCache(KEYWORDS_SEARCHED_CACHE_TTL)
+
+
+class SettingWriteBuffer:
+    """사용자별 설정 변경을 모아 두었다가 짧은 지연 후 한 번에 저장합니다 (write-behind).
+
+    변경은 캐시된 설정에 먼저 반영하고, 저장에 실패하면 변경 전 설정으로 되돌립니다.
+    """
+
+    def __init__(self, settings_cache, flush_delay=SETTING_FLUSH_DELAY):
+        self.settings_cache = settings_cache
+        self.flush_delay = flush_delay
+        self._pending = {}
+        self._snapshots = {}
+        self._writers = {}
+        self._timers = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def add(self, writer, user_id, key, value):
+        """변경을 대기열에 넣습니다. 같은 setting_key의 변경은 하나로 합칩니다."""
+        user_key = str(user_id)
+        with self._lock:
+            if user_key not in self._pending:
+                self._pending[user_key] = {}
+                self._snapshots[user_key] = copy.deepcopy(
+                    self.settings_cache.get(user_key)
+                )
+            pending = self._pending[user_key]
+            if key in pending:
+                _merge_setting_value(pending[key], copy.deepcopy(value))
+            else:
+                pending[key] = copy.deepcopy(value)
+            self._writers[user_key] = writer
+            self._restart_timer(user_key, user_id)
+
+        self.settings_cache.patch(
+            user_key, lambda cached: apply_setting_patch(cached, key, value)
+        )
+
+    def apply_pending(self, user_id, user_settings):
+        """서버에서 새로 받은 설정에 아직 저장하지 않은 변경을 다시 반영합니다."""
+        with self._lock:
+            pending = copy.deepcopy(self._pending.get(str(user_id), {}))
+        for key, value in pending.items():
+            apply_setting_patch(user_settings, key, value)
+        return user_settings
+
+    def flush(self, user_id):
+        """대기 중인 변경을 즉시 저장합니다. 실패하면 캐시를 변경 전으로 되돌립니다."""
+        user_key = str(user_id)
+        with self._lock:
+            timer = self._timers.pop(user_key, None)
+            if timer is not None:
+                timer.cancel()
+            pending = self._pending.pop(user_key, None)
+            snapshot = self._snapshots.pop(user_key, None)
+            writer = self._writers.pop(user_key, None)
+        if not pending:
+            return
+
+        try:
+            writer.update_settings(user_id, pending)
+        except Exception as e:
+            if snapshot is None:
+                self.settings_cache.invalidate(user_key)
+            else:
+                self.settings_cache.set(user_key, snapshot)
+            with self._lock:
+                self._failures[user_key] = (str(e), list(pending))
+
+    def pop_failure(self, user_id):
+        """마지막 저장 실패의 (오류 메시지, 되돌린 setting_key 목록)을 한 번만 반환합니다."""
+        with self._lock:
+            return self._failures.pop(str(user_id), None)
+
+    def _restart_timer(self, user_key, user_id):
+        timer = self._timers.get(user_key)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(self.flush_delay, self.flush, args=(user_id,))
+        timer.daemon = True
+        self._timers[user_key] = timer
+        timer.start()
+
+
+@st.cache_resource
+def get_setting_write_buffer():
+    """프로세스 공용 설정 저장 버퍼"""
+    return SettingWriteBuffer(get_settings_cache())
+
+
+def apply_setting_patch(user_settings, key, value):
+    """updateSetting 값을 캐시된 getSettings 응답에 반영합니다.
+
+    key를 가진 설정 항목을 찾아 반영했으면 True를 반환합니다.
+    """
+    for setting in user_settings.get("data", {}).get("viewSettings", []):
+        auto_daily = setting.get("autoDaily") or {}
+        owned_keys = {
+            auto_daily.get("executionStatusKey"),
+            auto_daily.get("executionTimeKey"),
+            *(source.get("checkboxKey") for source in setting.get("sources", [])),
+        }
+        if key in owned_keys:
+            _merge_setting_value(setting, value)
+            return True
+    return False
+
+
+def _merge_setting_value(target, value):
+    for field, new_value in value.items():
+        current = target.get(field)
+        if isinstance(current, dict) and isinstance(new_value, dict):
+            _merge_setting_value(current, new_value)
+        elif isinstance(current, list) and isinstance(new_value, list):
+            # sources 처럼 checkboxKey로 식별되는 항목 목록은 항목 단위로 병합
+            for item in new_value:
+                match = next(
+                    (
+                        c
+                        for c in current
+                        if c.get("checkboxKey") == item.get("checkboxKey")
+                    ),
+                    None,
+                )
+                if match is None:
+                    current.append(item)
+                else:
+                    _merge_setting_value(match, item)
+        else:
+            target[field] = new_value
+
+
+def normalize_keywords_searched(keywords_searched):
+    """화면에 필요한 항목이 빠진 getKeywordsSearched 응답을 빈 값으로 채워 반환합니다.
+
+    공유 캐시의 원본을 수정하지 않도록 빠진 항목이 있을 때만 새 dict를 만듭니다.
+    """
+    data = (
+        keywords_searched.get("data") if isinstance(keywords_searched, dict) else None
+    )
+    if not isinstance(data, dict):
+        return EMPTY_KEYWORDS_SEARCHED
+    empty_view_key_map = EMPTY_KEYWORDS_SEARCHED["data"]["viewKeyMap"]
+    fixed = {
+        name: {}
+        for name in ("keywords", "documents")
+        if not isinstance(data.get(name), dict)
+    }
+    view_key_map = data.get("viewKeyMap")
+    if not isinstance(view_key_map, dict):
+        fixed["viewKeyMap"] = empty_view_key_map
+    elif any(name not in view_key_map for name in empty_view_key_map):
+        fixed["viewKeyMap"] = {**empty_view_key_map, **view_key_map}
+    if not fixed:
+        return keywords_searched
+    return {**keywords_searched, "data": {**data, **fixed}}
+
+
+def get_keywords_cursor(keywords_searched):
+    """getKeywordsSearched 응답의 동기화 커서를 반환합니다.
+
+    서버가 cursor를 주지 않으면 가장 최근 날짜를 커서로 사용합니다.
+    """
+    data = keywords_searched.get("data") or {}
+    if data.get("cursor"):
+        return data["cursor"]
+    dates = [*data.get("keywords", {}), *data.get("documents", {})]
+    return max(dates) if dates else None
+
+
+def merge_keywords_delta(base, delta):
+    """getKeywordsSearched 증분 응답을 기존 전체 응답에 병합한 새 응답을 반환합니다.
+
+    기존 응답은 다른 세션이 읽고 있을 수 있으므로 수정하지 않고,
+    증분 응답에 포함된 날짜만 통째로 교체합니다.
+    """
+    base_data, delta_data = base["data"], delta["data"]
+
+    merged_data = {**base_data}
+    for field in ("keywords", "documents"):
+        by_date = {**base_data.get(field, {}), **delta_data.get(field, {})}
+        # 화면은 날짜 오름차순을 가정하고 역순으로 표시함
+        merged_data[field] = dict(sorted(by_date.items()))
+
+    def view_key_date(view_key):
+        # VIEW#DATE#2025-01-23#KEYWORD#... 형식에서 날짜 추출
+        parts = view_key.split("#", 3)
+        return parts[2] if len(parts) > 2 else None
+
+    view_key_map = {**base_data.get("viewKeyMap", {})}
+    for map_name, field in (
+        ("keywordKeyMap", "keywords"),
+        ("documentKeyMap", "documents"),
+    ):
+        changed_dates = set(delta_data.get(field, {}))
+        key_map = {
+            k: v
+            for k, v in base_data.get("viewKeyMap", {}).get(map_name, {}).items()
+            if view_key_date(k) not in changed_dates
+        }
+        key_map.update(delta_data.get("viewKeyMap", {}).get(map_name, {}))
+        view_key_map[map_name] = key_map
+    merged_data["viewKeyMap"] = view_key_map
+    merged_data["cursor"] = get_keywords_cursor(delta) or get_keywords_cursor(base)
+    merged_data.pop("isDelta", None)
+
+    return {**base, "data": merged_data}
+
+
+def get_record_key(record):
+    """dict를 필드 순서까지 포함해 같은 내용이면 같은 값이 되는 key로 바꿉니다."""
+    key = tuple(record.items())
+    try:
+        hash(key)
+    except TypeError:
+        # list/dict 값은 JSON 문자열로 비교
+        key = tuple(
+            (
+                field,
+                (
+                    json.dumps(value, sort_keys=True, ensure_ascii=False)
+                    if isinstance(value, (list, dict))
+                    else value
+                ),
+            )
+            for field, value in record.items()
+        )
+    return key
+
+
+class RecordTable:
+    """같은 내용의 dict를 한 번만 저장하는 열 단위 표입니다.
+
+    add()로 dict를 모은 뒤 freeze()하면 필드마다 열 하나를 만듭니다. 반복되는 문자열은
+    category로, 숫자는 numpy 배열로 저장하고, 행마다 원래 dict의 필드 순서를 저장해 두므로
+    get()은 원래와 같은 dict를 다시 만듭니다. identities는 identity 함수 값의 정수 code로,
+    중복 제거는 이 code를 비교합니다.
+    """
+
+    def __init__(self, identity):
+        self.identity = identity
+        self.frame = None
+        self.identities = None
+        self._rows = {}
+        self._records = []
+
+    def add(self, record):
+        """record의 행 번호를 반환합니다. 같은 내용의 dict는 같은 행을 사용합니다."""
+        key = get_record_key(record)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._records)
+            self._records.append(record)
+        return row
+
+    def freeze(self):
+        records = self._records
+        fields = list(dict.fromkeys(field for record in records for field in record))
+        self.frame = pd.DataFrame(
+            {
+                field: self._to_column([record.get(field) for record in records])
+                for field in fields
+            },
+            index=pd.RangeIndex(len(records)),
+        )
+        shape_codes, shapes = pd.factorize(
+            pd.Series([tuple(record) for record in records], dtype=object)
+        )
+        self._shape_codes = shape_codes.astype(np.int32)
+        self._shapes = list(shapes)
+        self.identities = pd.factorize(
+            pd.Series([str(self.identity(record)) for record in records], dtype=object)
+        )[0].astype(np.int32)
+        # get()에서 행을 고를 때 pandas 객체를 거치지 않도록 열의 numpy 배열을 미리 꺼내 둠
+        self._columns = {}
+        for field in fields:
+            values = self.frame[field].array
+            if isinstance(values, pd.Categorical):
+                self._columns[field] = (values.codes, values.categories.to_numpy())
+            else:
+                self._columns[field] = (values.to_numpy(), None)
+        del self._rows, self._records
+        return self
+
+    @staticmethod
+    def _to_column(values):
+        present = [value for value in values if value is not None]
+        if present and all(type(value) is str for value in present):
+            # 고유 값이 적은 문자열(출처, 키워드 이름 등)만 category로 저장
+            if len(set(present)) <= len(values) * HISTORY_CATEGORY_RATIO:
+                return pd.Categorical(values)
+        elif len(present) == len(values) and present:
+            for kind in (int, float):
+                if all(type(value) is kind for value in present):
+                    return pd.array(values, dtype=np.dtype(kind))
+        return pd.array(values, dtype=object)
+
+    def __len__(self):
+        return len(self._shape_codes)
+
+    def get(self, rows):
+        """행 번호 배열의 dict를 순서대로 새로 만들어 반환합니다."""
+        rows = np.asarray(rows, dtype=np.intp)
+        if not len(rows):
+            return []
+        columns = {}
+        for field, (values, categories) in self._columns.items():
+            if categories is None:
+                columns[field] = values[rows].tolist()
+                continue
+            codes = values[rows]
+            if (codes >= 0).all():
+                columns[field] = categories[codes].tolist()
+            else:
+                # 값이 None인 행은 code가 -1
+                columns[field] = [
+                    categories[code] if code >= 0 else None for code in codes.tolist()
+                ]
+        return [
+            {field: columns[field][i] for field in self._shapes[shape]}
+            for i, shape in enumerate(self._shape_codes[rows].tolist())
+        ]
+
+
+def gather_edges(offsets, targets, rows):
+    """rows 각 행의 offsets[row]:offsets[row + 1] 구간의 targets를 이어 붙여 반환합니다.
+
+    (이어 붙인 값, 행별 개수)를 반환합니다.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(
+        counts.sum()
+    )
+    return targets[positions], counts
+
+
+def split_by_counts(items, counts):
+    """items를 counts 개수씩 나눈 목록을 반환합니다."""
+    ends = itertools.accumulate(counts)
+    return [items[end - count : end] for count, end in zip(counts, ends)]
+
+
+class KeywordHistoryTables:
+    """getKeywordsSearched 응답을 열 단위 표로 바꾼 읽기 전용 키워드 기록입니다.
+
+    응답의 dict 대신 이 객체를 캐시에 두며, 같은 내용의 키워드/뉴스 dict는 한 번만 저장합니다.
+    - keywords / documents: 키워드, 뉴스 dict (RecordTable)
+    - keyword_items / document_items: 날짜별 목록 (keywords / documents 필드)의 항목.
+      date, 항목의 키워드 또는 뉴스 행 번호와, 딸린 뉴스 또는 키워드의 offsets/targets
+    - keyword_keys / document_keys: viewKeyMap의 keywordKeyMap / documentKeyMap.
+      체크박스 key가 인덱스이며 딸린 dict의 행 번호를 저장
+    - dates: 날짜별 키워드/뉴스 수와 목록의 시작 위치 (최근 날짜부터)
+    화면에는 펼친 날짜와 선택한 항목만 dict로 다시 만들어 사용합니다.
+    응답을 수정하지 않으므로 여러 세션이 같은 표를 공유합니다.
+    """
+
+    def __init__(self, keywords_searched, versions=None):
+        data = normalize_keywords_searched(keywords_searched)["data"]
+        self.cursor = get_keywords_cursor({"data": data})
+        self.keywords = RecordTable(get_keyword_identity)
+        self.documents = RecordTable(get_document_identity)
+
+        self.keyword_items = self._collect_items(
+            data["keywords"], "keyword", self.keywords, "documents", self.documents
+        )
+        self.document_items = self._collect_items(
+            data["documents"], None, self.documents, "keywords", self.keywords
+        )
+        view_key_map = data["viewKeyMap"]
+        self.keyword_keys = self._collect_keys(
+            view_key_map["keywordKeyMap"],
+            {"keyword": self.keywords},
+            ("documents", self.documents),
+        )
+        self.document_keys = self._collect_keys(
+            view_key_map["documentKeyMap"],
+            {"document": self.documents, "keyword": self.keywords},
+        )
+        self.keywords.freeze()
+        self.documents.freeze()
+
+        self.dates = pd.DataFrame(
+            {
+                field: items["frame"].groupby("date", observed=True).size()
+                for field, items in (
+                    ("keywords", self.keyword_items),
+                    ("documents", self.document_items),
+                )
+            },
+            index=pd.Index(
+                sorted({*data["keywords"], *data["documents"]}, reverse=True),
+                name="date",
+            ),
+        ).astype("Int32")
+        for field, items in (
+            ("keywords", self.keyword_items),
+            ("documents", self.document_items),
+        ):
+            # 목록은 날짜별로 이어져 있으므로 날짜의 첫 행 위치만 알면 구간을 구할 수 있음
+            starts = items["frame"].reset_index().groupby("date", observed=True)
+            self.dates[f"{field}_start"] = starts["index"].min().astype("Int32")
+            # 응답에 있는 빈 날짜도 목록에 표시
+            present = [date for date in data[field] if date in self.dates.index]
+            self.dates.loc[present, field] = self.dates.loc[present, field].fillna(0)
+        # 증분 응답으로 바뀌지 않은 날짜는 이전 버전을 유지 (검색 색인 재사용에 사용)
+        versions = versions or {}
+        self.versions = {
+            date: versions.get(date) or object() for date in self.dates.index
+        }
+        self._date_counts = {
+            field: self.dates[field].dropna() for field in ("keywords", "documents")
+        }
+
+    @staticmethod
+    def _collect_items(items_by_date, record_field, records, edge_field, edge_records):
+        """날짜별 목록을 (date, 항목 행 번호) 표와 딸린 dict의 offsets/targets로 모읍니다.
+
+        record_field가 None이면 항목 자체(edge_field를 뺀 dict)를 저장합니다.
+        """
+        dates, rows, offsets, targets = [], [], [0], []
+        for date, items in items_by_date.items():
+            for item in items or []:
+                if record_field is None:
+                    record = {k: v for k, v in item.items() if k != edge_field}
+                else:
+                    record = item.get(record_field) or {}
+                dates.append(date)
+                rows.append(records.add(record))
+                targets.extend(map(edge_records.add, item.get(edge_field) or []))
+                offsets.append(len(targets))
+        frame = pd.DataFrame(
+            {"date": pd.Categorical(dates), "row": np.array(rows, dtype=np.int32)}
+        )
+        return {
+            "frame": frame,
+            "row": frame["row"].to_numpy(),
+            "offsets": np.array(offsets, dtype=np.int64),
+            "targets": np.array(targets, dtype=np.int32),
+        }
+
+    @staticmethod
+    def _collect_keys(key_map, record_fields, edges=None):
+        """viewKeyMap 하나를 체크박스 key 인덱스의 표로 모읍니다."""
+        columns = {field: [] for field in record_fields}
+        offsets, targets = [0], []
+        for item in key_map.values():
+            for field, records in record_fields.items():
+                columns[field].append(records.add(item.get(field) or {}))
+            if edges is not None:
+                edge_field, edge_records = edges
+                targets.extend(map(edge_records.add, item.get(edge_field) or []))
+                offsets.append(len(targets))
+        frame = pd.DataFrame(
+            {field: np.array(rows, dtype=np.int32) for field, rows in columns.items()},
+            index=pd.Index(list(key_map), dtype=object, name="view_key"),
+        )
+        return {
+            "frame": frame,
+            # 선택할 때마다 pandas 객체를 거치지 않도록 열의 numpy 배열(view)을 꺼내 둠
+            **{field: frame[field].to_numpy() for field in columns},
+            "offsets": np.array(offsets, dtype=np.int64),
+            "targets": np.array(targets, dtype=np.int32),
+        }
+
+    def get_date_counts(self, field):
+        """field("keywords" 또는 "documents")가 있는 날짜별 항목 수를 최근 날짜부터 반환합니다."""
+        return self._date_counts[field]
+
+    def get_items(self, field, date, positions=None):
+        """date의 목록 항목을 응답과 같은 dict로 만들어 반환합니다.
+
+        positions를 주면 그 위치의 항목만 순서대로 반환합니다.
+        """
+        count = self.dates.at[date, field]
+        if pd.isna(count) or not count:
+            return []
+        start = int(self.dates.at[date, f"{field}_start"])
+        rows = start + (
+            np.arange(int(count))
+            if positions is None
+            else np.asarray(positions, dtype=np.intp)
+        )
+        if field == "keywords":
+            items = self.keyword_items
+            records, edge_records = self.keywords, self.documents
+        else:
+            items = self.document_items
+            records, edge_records = self.documents, self.keywords
+        edge_rows, counts = gather_edges(items["offsets"], items["targets"], rows)
+        edges = split_by_counts(edge_records.get(edge_rows), counts.tolist())
+        item_records = records.get(items["row"][rows])
+        if field == "keywords":
+            return [
+                {"keyword": keyword, "documents": documents}
+                for keyword, documents in zip(item_records, edges)
+            ]
+        return [
+            {**document, "keywords": keywords}
+            for document, keywords in zip(item_records, edges)
+        ]
+
+    def get_version(self, date):
+        return self.versions[date]
+
+    def _get_rows(self, keys, view_keys):
+        """체크박스 key 순서대로 keys 표의 행 위치를 반환합니다. 기록에 없는 key는 건너뜁니다."""
+        # 선택은 보통 몇 개이므로 인덱스의 해시 테이블에서 key마다 찾음
+        index = keys["frame"].index
+        return np.fromiter(
+            (index.get_loc(key) for key in view_keys if key in index), dtype=np.intp
+        )
+
+    @staticmethod
+    def _unique_rows(records, rows):
+        """identity가 같은 행 중 처음 나온 것만 순서대로 남깁니다."""
+        _, first = np.unique(records.identities[rows], return_index=True)
+        return rows[np.sort(first)]
+
+    def resolve_selection(self, keyword_keys, document_keys):
+        """선택한 체크박스 key로 보고서에 넣을 (키워드 목록, 뉴스 목록)을 구합니다.
+
+        선택한 순서를 유지하며, 키워드는 (en, ko), 뉴스는 URL이 같은 항목 중
+        처음 나온 것만 남깁니다. 키워드를 선택한 순서대로, 같은 키워드 안에서는
+        원래 순서대로 뉴스를 나열한 뒤 뉴스로 선택한 항목을 잇습니다.
+        """
+        keyword_rows = self._get_rows(self.keyword_keys, keyword_keys)
+        document_rows = self._get_rows(self.document_keys, document_keys)
+        linked_documents, _ = gather_edges(
+            self.keyword_keys["offsets"], self.keyword_keys["targets"], keyword_rows
+        )
+        keywords = self._unique_rows(
+            self.keywords,
+            np.concatenate(
+                [
+                    self.keyword_keys["keyword"][keyword_rows],
+                    self.document_keys["keyword"][document_rows],
+                ]
+            ),
+        )
+        documents = self._unique_rows(
+            self.documents,
+            np.concatenate(
+                [
+                    linked_documents,
+                    self.document_keys["document"][document_rows],
+                ]
+            ),
+        )
+        return self.keywords.get(keywords), self.documents.get(documents)
+
+    def to_payload(self):
+        """응답과 같은 구조의 getKeywordsSearched 응답을 다시 만듭니다 (증분 병합에 사용)."""
+        data = {"keywords": {}, "documents": {}}
+        for field in ("keywords", "documents"):
+            for date in sorted(self.get_date_counts(field).index):
+                data[field][date] = self.get_items(field, date)
+        keyword_rows = np.arange(len(self.keyword_keys["frame"]))
+        document_frame = self.document_keys["frame"]
+        linked_documents, counts = gather_edges(
+            self.keyword_keys["offsets"], self.keyword_keys["targets"], keyword_rows
+        )
+        data["viewKeyMap"] = {
+            "keywordKeyMap": {
+                view_key: {"keyword": keyword, "documents": documents}
+                for view_key, keyword, documents in zip(
+                    self.keyword_keys["frame"].index,
+                    self.keywords.get(self.keyword_keys["keyword"]),
+                    split_by_counts(
+                        self.documents.get(linked_documents), counts.tolist()
+                    ),
+                )
+            },
+            "documentKeyMap": {
+                view_key: {"document": document, "keyword": keyword}
+                for view_key, document, keyword in zip(
+                    document_frame.index,
+                    self.documents.get(self.document_keys["document"]),
+                    self.keywords.get(self.document_keys["keyword"]),
+                )
+            },
+        }
+        data["cursor"] = self.cursor
+        return {"data": data}
+
+    def merge(self, delta):
+        """증분 응답을 병합한 새 표를 반환합니다. 바뀌지 않은 날짜는 버전을 유지합니다."""
+        delta_data = delta.get("data") or {}
+        changed = {*delta_data.get("keywords", {}), *delta_data.get("documents", {})}
+        return KeywordHistoryTables(
+            merge_keywords_delta(self.to_payload(), delta),
+            {
+                date: version
+                for date, version in self.versions.items()
+                if date not in changed
+            },
+        )
+
+
+@functools.lru_cache(maxsize=SEARCH_TOKEN_CACHE_SIZE)
+def tokenize_search_word(word):
+    """단어 하나의 검색 토큰을 반환합니다.
+
+    한글 단어는 조사가 붙어도 찾을 수 있도록 음절 하나씩과 음절 bigram을,
+    그 밖의 단어는 단어 전체를 토큰으로 사용합니다.
+    """
+    if "\uac00" <= word[0] <= "\ud7a3":
+        return frozenset([*word, *(word[i : i + 2] for i in range(len(word) - 1))])
+    return frozenset([word])
+
+
+def tokenize_search_text(text):
+    """검색용 토큰 집합을 만듭니다 (같은 단어가 반복되므로 단어별 결과를 캐시).
+
+    띄어 쓴 한글 단어 사이의 bigram도 넣어, 공백을 뺀 글의 bigram을 모두 포함합니다.
+    """
+    text = str(text).lower()
+    words = SEARCH_TOKEN_PATTERN.findall(text)
+    tokens = set().union(*map(tokenize_search_word, words))
+    tokens.update(map("".join, SEARCH_SPACED_BIGRAM_PATTERN.findall(text)))
+    return tokens
+
+
+def strip_search_particle(word):
+    """한글 검색어 끝의 조사를 뗍니다. 두 음절 이상 남는 경우에만 뗍니다.
+
+    "건설을"로 검색해도 "건설의", "건설" 이 들어간 항목을 찾기 위한 것으로,
+    뗀 단어의 bigram은 원래 단어 bigram의 부분집합이므로 원래 검색 결과도 모두 포함합니다.
+    """
+    for particle in SEARCH_QUERY_PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[: -len(particle)]
+    return word
+
+
+def parse_search_query(query):
+    """검색어를 (토큰, 앞부분 일치 여부) 목록으로 바꿉니다. 모든 토큰이 일치해야 합니다."""
+    terms = []
+    for word in SEARCH_TOKEN_PATTERN.findall(query.lower()):
+        if "\uac00" <= word[0] <= "\ud7a3":
+            word = strip_search_particle(word)
+            grams = [word[i : i + 2] for i in range(len(word) - 1)] or [word]
+            terms.extend((gram, False) for gram in grams)
+        else:
+            # 영문/숫자는 입력 중인 단어도 찾도록 앞부분 일치
+            terms.append((word, True))
+    return terms
+
+
+KEYWORD_SEARCH_FIELDS = ("viewLabel", "ko", "en")
+DOCUMENT_SEARCH_FIELDS = ("titleShort", "content")
+
+
+class KeywordSearchIndex:
+    """키워드 기록(Keyword/News 탭) 검색용 역색인입니다.
+
+    (탭, 날짜)별로 나눈 색인을 두고, 토큰마다 그 날짜 목록에서 토큰이 나온 위치를
+    비트마스크(int)로 저장합니다. 기록이 갱신되면 버전이 바뀐 날짜만 다시 색인하므로
+    증분 응답으로 새 날짜가 추가될 때는 그 날짜만 색인합니다.
+    키워드 항목은 키워드와 딸린 뉴스의 제목/본문으로, 뉴스 항목은 뉴스와 딸린 키워드로 찾습니다.
+    """
+
+    def __init__(self):
+        self._partitions = {}
+        self._indexed = None
+        self._warming = None
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+
+    @staticmethod
+    def _get_item_parts(field, item):
+        """항목에서 검색할 (dict, 필드 목록) 쌍을 나열합니다."""
+        if field == "keywords":
+            yield item.get("keyword") or {}, KEYWORD_SEARCH_FIELDS
+            for document in item.get("documents") or []:
+                yield document, DOCUMENT_SEARCH_FIELDS
+        else:
+            yield item, DOCUMENT_SEARCH_FIELDS
+            for keyword in item.get("keywords") or []:
+                yield keyword, KEYWORD_SEARCH_FIELDS
+
+    def _index_items(self, field, items, token_cache):
+        postings = {}
+        for position, item in enumerate(items):
+            bit = 1 << position
+            tokens = set()
+            for source, fields in self._get_item_parts(field, item):
+                for name in fields:
+                    # 같은 뉴스가 두 탭에, 같은 키워드가 여러 날짜에 나오므로 문자열별로 한 번만 토큰화
+                    text = source.get(name)
+                    if not text:
+                        continue
+                    if text not in token_cache:
+                        token_cache[text] = tokenize_search_text(text)
+                    tokens |= token_cache[text]
+            for token in tokens:
+                postings[token] = postings.get(token, 0) | bit
+        return len(items), postings, sorted(postings)
+
+    def update(self, history):
+        """기록(KeywordHistoryTables)의 날짜 중 색인과 버전이 다른 날짜만 다시 색인합니다."""
+        with self._lock:
+            if self._indexed is history:
+                return self._partitions
+            partitions = {}
+            token_cache = {}
+            for field in ("keywords", "documents"):
+                for date in history.get_date_counts(field).index:
+                    version = history.get_version(date)
+                    partition = self._partitions.get((field, date))
+                    if partition is None or partition[0] is not version:
+                        partition = (
+                            version,
+                            *self._index_items(
+                                field, history.get_items(field, date), token_cache
+                            ),
+                        )
+                    partitions[(field, date)] = partition
+            self._partitions = partitions
+            self._indexed = history
+            return partitions
+
+    def update_in_background(self, history):
+        """색인이 history와 다르면 검색 전에 미리 백그라운드에서 갱신합니다."""
+        with self._warm_lock:
+            if self._indexed is history or self._warming is history:
+                return
+            self._warming = history
+        threading.Thread(target=self._warm, args=(history,), daemon=True).start()
+
+    def _warm(self, history):
+        try:
+            self.update(history)
+        finally:
+            with self._warm_lock:
+                if self._warming is history:
+                    self._warming = None
+
+    @staticmethod
+    def _lookup(postings, vocabulary, term, is_prefix):
+        if not is_prefix:
+            return postings.get(term, 0)
+        mask = 0
+        i = bisect.bisect_left(vocabulary, term)
+        while i < len(vocabulary) and vocabulary[i].startswith(term):
+            mask |= postings[vocabulary[i]]
+            i += 1
+        return mask
+
+    def search(self, history, query):
+        """query의 모든 토큰이 나오는 항목의 위치를 {탭: {날짜: [위치, ...]}}로 반환합니다.
+
+        검색어가 비어 있으면 None을 반환합니다.
+        """
+        terms = parse_search_query(query or "")
+        if not terms:
+            return None
+        matches = {"keywords": {}, "documents": {}}
+        for (field, date), (_, count, postings, vocabulary) in self.update(
+            history
+        ).items():
+            mask = -1
+            for term, is_prefix in terms:
+                mask &= self._lookup(postings, vocabulary, term, is_prefix)
+                if not mask:
+                    break
+            if mask:
+                matches[field][date] = [
+                    position for position in range(count) if mask >> position & 1
+                ]
+        return matches
+
+
+@st.cache_resource
+def get_keyword_search_index():
+    """키워드 기록 검색 색인 (프로세스 공용)"""
+    return KeywordSearchIndex()
+
+
+class ReportCache:
+    """작성된 보고서를 (키워드, 뉴스 URL, 보고서 종류)의 해시로 저장하는 SQLite 캐시입니다.
+
+    최근에 사용하지 않은 보고서부터 지워 개수와 전체 크기를 제한합니다.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_entries=REPORT_CACHE_MAX_ENTRIES,
+        max_bytes=REPORT_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=10
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            " key TEXT PRIMARY KEY,"
+            " report TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS reports_last_used_at"
+            " ON reports (last_used_at)"
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(keywords, documents, report_type):
+        """키워드와 뉴스의 순서, 중복과 관계없이 같은 선택이면 같은 키를 반환합니다."""
+        canonical = {
+            "keywords": sorted({str(get_keyword_identity(k)) for k in keywords}),
+            "news": sorted({str(get_document_identity(d)) for d in documents}),
+            "report_type": report_type,
+        }
+        return hashlib.sha256(
+            json.dumps(canonical, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT report FROM reports WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE reports SET last_used_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        return json.loads(row[0])
+
+    def set(self, key, report):
+        report_json = json.dumps(report, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)",
+                (key, report_json, len(report_json.encode("utf-8")), now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        count, total_size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reports"
+        ).fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+        # 최근에 사용한 순서로 한도 안에 드는 보고서만 남김
+        keep_count, keep_size, evicted = 0, 0, []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM reports ORDER BY last_used_at DESC"
+        ).fetchall():
+            if keep_count < self.max_entries and keep_size + size <= self.max_bytes:
+                keep_count += 1
+                keep_size += size
+            else:
+                evicted.append((key,))
+        self._conn.executemany("DELETE FROM reports WHERE key = ?", evicted)
+
+
+@st.cache_resource
+def get_report_cache():
+    """프로세스 공용 보고서 캐시"""
+    return ReportCache(REPORT_CACHE_PATH)
+
+
+class ReportJob:
+    def __init__(self, job_key, keywords, documents):
+        self.job_id = uuid.uuid4().hex
+        self.job_key = job_key
+        self.keywords = keywords
+        self.documents = documents
+        # 스크립트가 다시 실행될 때마다 Enum 클래스가 새로 만들어지므로
+        # 프로세스 공용 객체에는 Enum 대신 value를 저장
+        self.status = ReportJobStatus.QUEUED.value
+        self.result = None
+        self.error = None
+        self.is_streaming = False
+        self.is_from_cache = False
+        self.cache_key = None
+        # 스트리밍 중 지금까지 받은 보고서 본문
+        self.partial_text = ""
+        self.created_at = time.time()
+        self.started_at = None
+        self.first_chunk_at = None
+        self.finished_at = None
+        self._finished = threading.Event()
+
+    def is_pending(self):
+        return self.status in (
+            ReportJobStatus.QUEUED.value,
+            ReportJobStatus.RUNNING.value,
+        )
+
+    def finish(self):
+        self.finished_at = time.time()
+        self._finished.set()
+
+    def wait(self, timeout=None):
+        """작업이 끝날 때까지 기다립니다. 끝났으면 True를 반환합니다."""
+        return self._finished.wait(timeout)
+
+    def get_elapsed_seconds(self):
+        return (self.finished_at or time.time()) - (self.started_at or time.time())
+
+    def get_time_to_first_chunk(self):
+        """작업 시작부터 보고서 내용이 처음 보이기까지 걸린 시간 (초)"""
+        if self.first_chunk_at is None or self.started_at is None:
+            return None
+        return self.first_chunk_at - self.started_at
+
+
+class ReportJobManager:
+    """보고서 작성을 백그라운드 스레드에서 실행하고 결과를 보관합니다.
+
+    같은 키워드/뉴스 선택으로 다시 요청하면 진행 중이거나 완료된 작업을 재사용합니다.
+    """
+
+    def __init__(
+        self,
+        report_cache=None,
+        max_workers=REPORT_JOB_WORKERS,
+        history=REPORT_JOB_HISTORY,
+    ):
+        self.report_cache = report_cache
+        self.history = history
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="report-job"
+        )
+        self._jobs = {}
+        self._jobs_by_key = {}
+        self._first_chunk_times = {
+            "stream": deque(maxlen=200),
+            "one-shot": deque(maxlen=200),
+        }
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_job_key(user_id, keywords, documents):
+        """선택한 키워드/뉴스가 같으면 순서와 관계없이 같은 키를 반환합니다."""
+        selection = {
+            "user_id": user_id,
+            "keywords": sorted(map(str, map(get_keyword_identity, keywords))),
+            "news": sorted(map(str, map(get_document_identity, documents))),
+        }
+        return hashlib.sha256(
+            json.dumps(selection, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def submit(
+        self,
+        job_key,
+        keywords,
+        documents,
+        make_report,
+        streaming=False,
+        cache_key=None,
+        regenerate=False,
+    ):
+        """make_report(keywords, documents)를 백그라운드로 실행하는 작업을 반환합니다.
+
+        streaming이면 make_report는 보고서 본문 조각을 차례로 내보내는 generator입니다.
+        cache_key의 보고서가 캐시에 있으면 작성하지 않고 완료된 작업을 바로 반환하며,
+        regenerate이면 완료된 작업과 캐시를 무시하고 새로 작성합니다.
+        """
+        cached_report = None
+        if cache_key and self.report_cache is not None and not regenerate:
+            cached_report = self.report_cache.get(cache_key)
+
+        with self._lock:
+            job = self._jobs.get(self._jobs_by_key.get(job_key))
+            if job is not None and (
+                job.is_pending()
+                or (job.status == ReportJobStatus.DONE.value and not regenerate)
+            ):
+                return job
+            job = ReportJob(job_key, keywords, documents)
+            job.is_streaming = streaming
+            job.cache_key = cache_key
+            if cached_report is not None:
+                job.is_from_cache = True
+                job.result = cached_report
+                job.status = ReportJobStatus.DONE.value
+                job.started_at = time.time()
+                job.finish()
+            self._jobs[job.job_id] = job
+            self._jobs_by_key[job_key] = job.job_id
+            self._evict()
+        if cached_report is None:
+            self._executor.submit(self._run, job, make_report)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, make_report):
+        job.started_at = time.time()
+        job.status = ReportJobStatus.RUNNING.value
+        try:
+            if job.is_streaming:
+                for chunk in make_report(job.keywords, job.documents):
+                    if not chunk:
+                        continue
+                    if job.first_chunk_at is None:
+                        job.first_chunk_at = time.time()
+                    job.partial_text += chunk
+                job.result = {"data": job.partial_text}
+            else:
+                job.result = make_report(job.keywords, job.documents)
+                job.first_chunk_at = time.time()
+            # 빈 스트림([DONE]만 온 경우 등)은 실패로 처리하고 캐시하지 않음
+            if not (job.result or {}).get("data"):
+                raise Exception("보고서 내용이 비어 있습니다.")
+            job.status = ReportJobStatus.DONE.value
+            self._record_first_chunk(job)
+            if job.cache_key and self.report_cache is not None:
+                self.report_cache.set(job.cache_key, job.result)
+        except Exception as e:
+            job.error = str(e)
+            job.status = ReportJobStatus.FAILED.value
+        finally:
+            job.finish()
+
+    def _record_first_chunk(self, job):
+        mode = "stream" if job.is_streaming else "one-shot"
+        with self._lock:
+            self._first_chunk_times[mode].append(job.get_time_to_first_chunk())
+
+    def get_first_chunk_stats(self):
+        """스트리밍/일괄 방식별로 보고서 내용이 처음 보이기까지 걸린 시간 통계 (초)"""
+        with self._lock:
+            snapshot = {
+                mode: sorted(seconds for seconds in times if seconds is not None)
+                for mode, times in self._first_chunk_times.items()
+            }
+        return {
+            mode: {
+                "count": len(times),
+                "p50": round(times[len(times) // 2], 3),
+                "p95": round(times[int(len(times) * 0.95)], 3),
+            }
+            for mode, times in snapshot.items()
+            if times
+        }
+
+    def _evict(self):
+        # 오래된 완료 작업부터 정리 (진행 중인 작업은 유지)
+        finished = [job for job in self._jobs.values() if not job.is_pending()]
+        for job in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job.job_id]
+            if self._jobs_by_key.get(job.job_key) == job.job_id:
+                del self._jobs_by_key[job.job_key]
+
+
+@st.cache_resource
+def get_report_job_manager():
+    """프로세스 공용 보고서 작업 관리자"""
+    return ReportJobManager(get_report_cache())
+
+
+class ReportJobDisplay:
+    def __init__(self, report_jobs):
+        self.report_jobs = report_jobs
+
+    def show_report(self, job_id):
+        """보고서 작업 결과를 표시합니다. 진행 중이면 이 영역만 주기적으로 갱신합니다."""
+        job = self.report_jobs.get(job_id) if job_id else None
+        if job is None:
+            return
+        poll_interval = (
+            REPORT_STREAM_POLL_INTERVAL if job.is_streaming else REPORT_POLL_INTERVAL
+        )
+        run_every = poll_interval if job.is_pending() else None
+        st.fragment(self._show_job, run_every=run_every)(
+            job_id, is_polling=run_every is not None
+        )
+
+    def _show_job(self, job_id, is_polling):
+        job = self.report_jobs.get(job_id)
+        if job is None:
+            return
+        if job.status == ReportJobStatus.QUEUED.value:
+            st.info("보고서 작성 대기 중...")
+        elif job.status == ReportJobStatus.RUNNING.value:
+            st.info(f"보고서 작성 중... ({int(job.get_elapsed_seconds())}초)")
+            if job.partial_text:
+                st.markdown(job.partial_text)
+        elif job.status == ReportJobStatus.DONE.value:
+            st.markdown(job.result["data"])
+            if job.is_from_cache:
+                st.caption(
+                    "저장된 보고서입니다. 새로 작성하려면 '다시 작성'을 선택하세요."
+                )
+            elif job.get_time_to_first_chunk() is not None:
+                st.caption(
+                    f"첫 내용 표시까지 {job.get_time_to_first_chunk():.1f}초 · "
+                    f"전체 {job.get_elapsed_seconds():.1f}초"
+                )
+        else:
+            st.error(f"보고서 작성 실패: {job.error}")
+
+        if is_polling and not job.is_pending():
+            # 작업이 끝나면 주기적 갱신을 멈추기 위해 전체를 한 번 다시 실행
+            st.rerun()
+
+
+class SearchSourcesIgnoredError(Exception):
+    """백엔드가 searchKeyword 요청의 sources를 무시하고 전체 소스를 검색한 경우"""
+
+    def __init__(self, result):
+        super().__init__("백엔드가 소스별 검색을 지원하지 않습니다.")
+        self.result = result
+
+
+class APIManager:
+    def __init__(self, context):
+        self.context = context
+        self.keyword_finder_url = keyword_finder_url
+        self.report_maker_url = report_maker_url
+        self.app_manager_url = app_manager_url
+        self.transport = context.transport
+        self.search_cache = context.search_cache
+        self.search_source_support = context.search_source_support
+        self.is_localhost = context.is_localhost
+
+    def _is_localhost(self):
+        return self.is_localhost
+
+    async def _get_dummy_data(self):
+        dummy_file = Path(__file__).parent / "dummy.json"
+        with open(dummy_file, "r", encoding="utf-8") as f:
+            dummy_data = json.load(f)
+        await asyncio.sleep(1)
+        return dummy_data
+
+    async def _get_dummy_report(self):
+        dummy_file = Path(__file__).parent / "dummy-report.json"
+        with open(dummy_file, "r", encoding="utf-8") as f:
+            dummy_data = json.load(f)
+        await asyncio.sleep(1)
+        return dummy_data
+
+    def search(
+        self,
+        search_keyword_type: SearchKeywordType,
+        start_date,
+        period_days,
+        sources=None,
+    ):
+        """
+        키워드 검색을 실행하고 결과를 반환합니다.
+
+        백엔드는 서버에 저장된 설정의 소스를 검색하며, sources는 그 소스의 alias 목록입니다.
+        검색 유형, 기간, 소스가 같은 결과는 모든 세션이 공유하며
+        같은 검색이 동시에 요청되면 한 번만 요청합니다.
+        """
+        return self.search_cache.get_or_fetch(
+            self._get_search_cache_key(
+                search_keyword_type, start_date, period_days, sources
+            ),
+            lambda: self._request_search(search_keyword_type, start_date, period_days),
+        )
+
+    def _get_search_cache_key(
+        self, search_keyword_type, start_date, period_days, sources
+    ):
+        # 소스를 알 수 없으면 사용자의 저장된 설정으로 검색되므로 사용자별로 구분
+        return (
+            search_keyword_type.value,
+            start_date,
+            period_days,
+            (
+                ("user", self.context.user_id)
+                if sources is None
+                else tuple(sorted(sources))
+            ),
+        )
+
+    def is_source_search_supported(self):
+        """백엔드의 소스별 검색 지원 여부. 아직 확인하지 않았으면 None을 반환합니다."""
+        return self.search_source_support["supported"]
+
+    def search_source(
+        self, search_keyword_type, start_date, period_days, source, timeout=None
+    ):
+        """한 소스만 검색합니다. 결과는 search와 같은 캐시를 사용합니다.
+
+        응답의 sources가 [source]가 아니면 백엔드가 sources를 무시한 것이므로
+        캐시하지 않고 SearchSourcesIgnoredError를 발생시킵니다.
+        """
+
+        def fetch():
+            result = self._request_search(
+                search_keyword_type,
+                start_date,
+                period_days,
+                sources=[source],
+                timeout=timeout,
+            )
+            if result.get("sources") != [source]:
+                raise SearchSourcesIgnoredError(result)
+            return result
+
+        return self.search_cache.get_or_fetch(
+            self._get_search_cache_key(
+                search_keyword_type, start_date, period_days, [source]
+            ),
+            fetch,
+        )
+
+    def search_by_source(
+        self,
+        search_keyword_type,
+        start_date,
+        period_days,
+        sources,
+        timeout=SEARCH_SOURCE_TIMEOUT,
+        max_workers=SEARCH_SOURCE_CONCURRENCY,
+    ):
+        """소스별로 나누어 동시에 검색하고, 끝나는 순서대로 (소스, 결과, 오류)를 반환합니다.
+
+        timeout초 안에 끝나지 않은 소스는 오류로 처리하고 나머지 결과로 진행합니다.
+        백엔드의 지원 여부를 아직 모르면 응답으로 확인될 때까지 한 소스씩 먼저 검색합니다.
+        sources를 무시하는 백엔드라면 그 응답이 전체 검색 결과이므로 소스를 None으로
+        한 번만 반환하고 끝냅니다.
+        """
+        all_sources = list(sources)
+        sources = list(all_sources)
+        while sources and self.is_source_search_supported() is None:
+            source, *sources = sources
+            try:
+                result = self.search_source(
+                    search_keyword_type, start_date, period_days, source, timeout
+                )
+            except SearchSourcesIgnoredError as e:
+                self.search_source_support["supported"] = False
+                # 전체 검색과 같은 결과이므로 같은 캐시 key로 저장해 다시 검색하지 않음
+                yield None, self.search_cache.get_or_fetch(
+                    self._get_search_cache_key(
+                        search_keyword_type, start_date, period_days, all_sources
+                    ),
+                    lambda: e.result,
+                ), None
+                return
+            except Exception as e:
+                # 오류 응답으로는 지원 여부를 알 수 없으므로 다음 소스로 다시 확인
+                yield source, None, str(e)
+            else:
+                self.search_source_support["supported"] = True
+                yield source, result, None
+        if not sources:
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="search-source"
+        )
+        futures = {
+            executor.submit(
+                self.search_source,
+                search_keyword_type,
+                start_date,
+                period_days,
+                source,
+                timeout,
+            ): source
+            for source in sources
+        }
+        # 동시 실행 수 제한 때문에 늦게 시작하는 소스까지 고려한 전체 제한 시간
+        deadline = timeout * math.ceil(len(futures) / max_workers)
+        remaining = dict(futures)
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                source = remaining.pop(future)
+                try:
+                    yield source, future.result(), None
+                except SearchSourcesIgnoredError as e:
+                    self.search_source_support["supported"] = False
+                    yield source, None, str(e)
+                except Exception as e:
+                    yield source, None, str(e)
+        except FuturesTimeoutError:
+            for source in remaining.values():
+                yield source, None, f"{timeout}초 안에 응답이 없습니다."
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _request_search(
+        self, search_keyword_type, start_date, period_days, sources=None, timeout=None
+    ):
+        """/searchKeyword 요청을 보냅니다.
+
+        sources를 지정하면 요청에 검색할 소스의 alias 목록("sources")을 추가합니다.
+        이를 지원하는 백엔드는 응답의 "sources"에 실제로 검색한 alias 목록을 돌려주며,
+        지정하지 않으면 서버에 저장된 사용자 설정의 소스를 검색합니다.
+        """
+        request_json = {
+            "user_id": self.context.user_id,
+            "search_keyword_type": search_keyword_type.value,
+            "start_date": start_date,
+            "period_days": period_days,
+        }
+        if sources is not None:
+            request_json["sources"] = sources
+        request_options = {}
+        if timeout is not None:
+            request_options["timeout"] = (DEFAULT_HTTP_TIMEOUT[0], timeout)
+        try:
+            response = self.transport.post(
+                f"{self.app_manager_url}/searchKeyword",
+                json=request_json,
+                **request_options,
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            raise Exception(f"API 요청 실패: {str(e)}")
+
+    def make_report(self, keywords, search_keyword_type: SearchKeywordType):
+        if self._is_localhost():
+            result = asyncio.run(self._get_dummy_report())
+            return result
+        else:
+            try:
+                response = self.transport.post(
+                    f"{self.app_manager_url}/makeReport",
+                    json={
+                        "user_id": self.context.user_id,
+                        "search_keyword_type": search_keyword_type.value,
                         "keywords": keywords,
                     },
                 )
@@ -543,10 +3407,10 @@ class APIManager:
             return result
         else:
             try:
-                response = requests.post(
+                response = self.transport.post(
                     f"{self.app_manager_url}/makeReportNew",
                     json={
-                        "user_id": user_id,
+                        "user_id": self.context.user_id,
                         "keywords": keywords,
                         "news": documents,
                     },
@@ -556,16 +3420,99 @@ class APIManager:
             except Exception as e:
                 raise Exception(f"API 요청 실패: {str(e)}")
 
+    def stream_report_new(self, keywords, documents):
+        """makeReportNew를 스트리밍으로 요청하고 보고서 본문 조각을 차례로 반환합니다.
+
+        백엔드가 스트리밍을 지원하지 않고 JSON으로 응답하면 전체 본문을 한 번에 반환합니다.
+        """
+        if self._is_localhost():
+            yield self.make_report_new(keywords, documents)["data"]
+            return
+
+        try:
+            response = self.transport.post(
+                f"{self.app_manager_url}/makeReportNew",
+                json={
+                    "user_id": self.context.user_id,
+                    "keywords": keywords,
+                    "news": documents,
+                    "stream": True,
+                },
+                headers={"Accept": "text/event-stream, application/json"},
+                stream=True,
+            )
+            with response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if content_type.startswith("application/json"):
+                    yield response.json()["data"]
+                elif content_type.startswith("text/event-stream"):
+                    yield from self._iter_sse_chunks(response)
+                else:
+                    # chunked text/plain, text/markdown
+                    if "charset" not in content_type:
+                        response.encoding = "utf-8"
+                    for chunk in response.iter_content(
+                        chunk_size=None, decode_unicode=True
+                    ):
+                        if chunk:
+                            yield chunk
+        except Exception as e:
+            raise Exception(f"API 요청 실패: {str(e)}")
+
+    @staticmethod
+    def _iter_sse_chunks(response):
+        """SSE 이벤트의 data를 보고서 본문 조각으로 변환합니다.
+
+        data는 일반 텍스트이거나 {"delta": "..."} 형태의 JSON이며, [DONE]은 종료를 뜻합니다.
+        """
+        data_lines = []
+        # SSE는 항상 UTF-8이며, 버퍼가 찰 때까지 기다리지 않고 도착한 만큼 바로 처리
+        # (chunk_size=None은 chunked 응답에서만 조각 단위로 읽고 그 외에는 끝까지 읽음)
+        response.encoding = "utf-8"
+        is_chunked = response.headers.get("Transfer-Encoding") == "chunked"
+        lines = response.iter_lines(
+            chunk_size=None if is_chunked else 1, decode_unicode=True
+        )
+        for line in itertools.chain(lines, [""]):
+            if line.startswith("data:"):
+                data_lines.append(line[5:].removeprefix(" "))
+                continue
+            if line or not data_lines:
+                continue
+            # 빈 줄이 이벤트의 끝 (스트림이 빈 줄 없이 끝나도 마지막 이벤트를 처리)
+            data = "\n".join(data_lines)
+            data_lines = []
+            if data == "[DONE]":
+                return
+            try:
+                payload = json.loads(data)
+            except ValueError:
+                yield data
+                continue
+            if isinstance(payload, dict):
+                yield payload.get("delta") or payload.get("data") or ""
+            else:
+                yield str(payload)
+
 
 class DBHandler:
-    def __init__(self):
-        self.base_url = st.secrets["db-handler-url"]
+    def __init__(self, context):
+        self.context = context
+        self.base_url = db_handler_url
+        self.transport = context.transport
+        self.settings_cache = context.settings_cache
+        self.setting_buffer = context.setting_buffer
+        self.bulk_settings_support = context.bulk_settings_support
+        self.app_config_cache = context.app_config_cache
+        self.keywords_searched_cache = context.keywords_searched_cache
 
     def create_user_if_needed(self):
         """Query 파라미터의 user 값을 확인하여 필요한 경우 사용자를 생성합니다."""
+        user_id = self.context.user_id
         try:
             if user_id and user_id.isdigit():
-                response = requests.post(
+                response = self.transport.post(
                     f"{self.base_url}/createUser", json={"user_id": int(user_id)}
                 )
                 response.raise_for_status()
@@ -574,19 +3521,32 @@ class DBHandler:
             st.error(f"사용자 생성 실패: {str(e)}")
             return None
 
-    def get_settings(self):
-        """사용자 설정과 소스 정보를 가져옵니다."""
-        try:
-            if user_id and user_id.isdigit():
-                response = requests.get(
-                    f"{self.base_url}/getSettings",
-                    params={"user_id": int(user_id)},
-                )
-                response.raise_for_status()
-                return response.json()
-        except Exception as e:
-            st.error(f"사용자 조회 실패: {str(e)}")
+    def fetch_settings(self):
+        """사용자 설정과 소스 정보를 가져옵니다. 실패 시 예외를 그대로 전달합니다."""
+        user_id = self.context.user_id
+        if not (user_id and user_id.isdigit()):
+            return None
+        # 화면 쪽에서 설정 dict를 수정하므로 캐시 원본 대신 복사본을 반환
+        cached = self.settings_cache.get(user_id)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        response = self.transport.get(
+            f"{self.base_url}/getSettings",
+            params={"user_id": int(user_id)},
+        )
+        response.raise_for_status()
+        user_settings = self.setting_buffer.apply_pending(user_id, response.json())
+        self.settings_cache.set(user_id, user_settings)
+        return copy.deepcopy(user_settings)
+
+    def peek_settings(self):
+        """만료 여부와 관계없이 마지막으로 받은 사용자 설정을 반환합니다 (없으면 None)."""
+        cached = self.settings_cache.peek(self.context.user_id)
+        if cached is None:
             return None
+        return self.setting_buffer.apply_pending(
+            self.context.user_id, copy.deepcopy(cached)
+        )
 
     def update_setting(
         self,
@@ -594,26 +3554,65 @@ class DBHandler:
         key: str,
         value,
     ):
+        """설정 하나를 저장합니다. 캐시는 설정 저장 버퍼가 반영하며, 실패 시 예외를 전달합니다."""
+        response = self.transport.put(
+            f"{self.base_url}updateSetting",
+            json={
+                "user_id": user_id,
+                "setting_key": key,
+                "value": value,
+            },
+        )
+        response.raise_for_status()
 
-        try:
-            requests.put(
-                f"{self.base_url}updateSetting",
+    def queue_setting_update(self, user_id, key, value):
+        """설정 변경을 화면에 바로 반영하고, 저장은 모아서 나중에 한 번에 합니다."""
+        self.setting_buffer.add(self, user_id, key, value)
+
+    def flush_setting_updates(self, user_id):
+        self.setting_buffer.flush(user_id)
+
+    def update_settings(self, user_id, changes):
+        """여러 설정 변경({setting_key: value})을 한 번의 요청으로 저장합니다.
+
+        버퍼의 타이머 스레드에서 호출되므로 st.* 를 사용하지 않고 실패 시 예외를 전달합니다.
+        """
+        if self.bulk_settings_support["supported"] is not False:
+            response = self.transport.put(
+                f"{self.base_url}updateSettings",
                 json={
                     "user_id": user_id,
-                    "setting_key": key,
-                    "value": value,
+                    "updates": [
+                        {"setting_key": key, "value": value}
+                        for key, value in changes.items()
+                    ],
                 },
             )
-        except Exception as e:
-            st.error(f"사용자 설정 업데이트 실패: {str(e)}")
+            if response.status_code not in (404, 405):
+                response.raise_for_status()
+                self.bulk_settings_support["supported"] = True
+                return
+            # 일괄 저장을 지원하지 않는 서버이므로 다음부터는 바로 설정별로 저장
+            response.close()
+            self.bulk_settings_support["supported"] = False
+        for key, value in changes.items():
+            self.update_setting(user_id, key, value)
 
     def get_app_config(self):
-        response = requests.get(f"{self.base_url}/getAppConfig")
+        cached = self.app_config_cache.get("app_config")
+        if cached is not None:
+            return cached
+        response = self.transport.get(f"{self.base_url}/getAppConfig")
         response.raise_for_status()
-        return response.json()
+        app_config = response.json()
+        self.app_config_cache.set("app_config", app_config)
+        return app_config
+
+    def peek_app_config(self):
+        return self.app_config_cache.peek("app_config")
 
     def get_keywords_by_date(self, date):
-        response = requests.get(
+        response = self.transport.get(
             f"{self.base_url}/getKeywords",
             params={"date": date},
         )
@@ -621,15 +3620,322 @@ class DBHandler:
         return response.json()
 
     def get_keywords_searched(self):
-        response = requests.get(
+        """모든 세션이 공유하는 키워드 기록(KeywordHistoryTables)을 반환합니다."""
+        return self.keywords_searched_cache.get(
+            "keywords_searched", self._fetch_keywords_searched
+        )
+
+    def peek_keywords_searched(self):
+        return self.keywords_searched_cache.peek("keywords_searched")
+
+    def refresh_keywords_searched(self):
+        """키워드 기록 캐시를 지금 갱신합니다 (미리 계산 작업에서 사용)."""
+        return self.keywords_searched_cache.refresh(
+            "keywords_searched", self._fetch_keywords_searched
+        )
+
+    def _fetch_keywords_searched(self):
+        """이전에 받은 응답이 있으면 커서 이후의 날짜만 받아 병합합니다."""
+        # 백그라운드 갱신 스레드에서도 호출되므로 st.* 를 사용하지 않음
+        previous = self.keywords_searched_cache.peek("keywords_searched")
+        cursor = previous.cursor if previous else None
+        if cursor is None:
+            return KeywordHistoryTables(self._request_keywords_searched())
+
+        # since는 커서 날짜를 포함하므로 당일 추가된 데이터도 다시 받음
+        delta = self._request_keywords_searched({"since": cursor})
+        delta_data = delta.get("data") or {}
+        if delta_data.get("resync"):
+            return KeywordHistoryTables(self._request_keywords_searched())
+        if not delta_data.get("isDelta"):
+            # since를 지원하지 않는 서버는 전체 응답을 그대로 반환함
+            return KeywordHistoryTables(delta)
+        return previous.merge(delta)
+
+    def _request_keywords_searched(self, params=None):
+        response = self.transport.get(
             f"{self.base_url}/getKeywordsSearched",
+            params=params,
         )
         response.raise_for_status()
         return response.json()
 
 
+class SessionContext:
+    """세션의 한 번의 실행에 필요한 사용자, 백엔드 클라이언트, 캐시를 묶은 객체입니다.
+
+    Streamlit은 세션마다 다른 스레드에서 스크립트를 실행하므로 사용자 정보를
+    모듈 전역에 두지 않고 실행마다 만들어 각 클래스에 전달합니다.
+    보고서 작업 같은 백그라운드 스레드에서도 읽을 수 있도록 st.* 값은 생성 시점에 읽어 둡니다.
+    """
+
+    def __init__(self, user_id, is_localhost=False, state=None):
+        self.user_id = user_id
+        self.is_localhost = is_localhost
+        self.transport = get_http_transport()
+        self.span_metrics = get_span_metrics()
+        self.search_cache = get_search_cache()
+        self.search_source_support = get_search_source_support()
+        self.settings_cache = get_settings_cache()
+        self.setting_buffer = get_setting_write_buffer()
+        self.bulk_settings_support = get_bulk_settings_support()
+        self.app_config_cache = get_app_config_cache()
+        self.keywords_searched_cache = get_keywords_searched_cache()
+        self.report_jobs = get_report_job_manager()
+        self.search_index = get_keyword_search_index()
+        self.state = state
+        self.db_handler = DBHandler(self)
+        self.api_manager = APIManager(self)
+        # 사용자 설정을 받은 뒤 main()에서 설정
+        self.keyword_logs = None
+
+    @classmethod
+    def from_session(cls, user_id):
+        """현재 세션의 query param과 사용자 상태 저장소로 컨텍스트를 만듭니다."""
+        return cls(
+            user_id,
+            is_localhost=bool(st.query_params.get("localhost", "")),
+            # 응답 로그, 검색 기간, 선택 목록은 사용자별로 저장 (저장소 설정에 따라 공유)
+            state=UserState(get_state_backend(), f"user:{user_id}"),
+        )
+
+
+def get_precompute_schedule(user_settings):
+    """getSettings 응답에서 auto-cron 실행 시각을 읽습니다.
+
+    자동 실행이 꺼져 있으면 None을 반환합니다.
+    """
+    settings = {
+        setting["settingType"]: setting
+        for setting in user_settings.get("data", {}).get("viewSettings", [])
+    }
+    auto_daily = settings.get(SettingsType.AUTO_CRON.value, {}).get("autoDaily") or {}
+    if not auto_daily.get("executionStatus"):
+        return None
+    return {"time": auto_daily.get("executionTime") or "00:00"}
+
+
+class PrecomputeScheduler:
+    """사용자별 auto-cron 설정 시각에 키워드 검색 기록과 보고서 캐시를 채웁니다.
+
+    자동 검색은 백엔드가 실행하므로, 그 결과가 담긴 기록과 보고서를
+    아침 첫 화면이 캐시에서 바로 읽히도록 미리 가져오며, 같은 시각을 설정한 사용자가
+    많아도 백엔드에 한꺼번에 몰리지 않게 실행 시각에 무작위 지연을 더하고
+    적은 수의 작업 스레드로 나누어 실행합니다. 백엔드의 자동 검색이 아직 끝나지 않아
+    오늘 기록이 없으면 PRECOMPUTE_RETRY_INTERVAL초 뒤에 다시 확인합니다.
+    등록한 일정은 schedules(StateCollection)에 저장해 두고 재시작하면 다시 불러옵니다.
+    프로세스마다 따로 실행되므로 여러 프로세스를 띄우면 한 곳에서만 사용하도록 설정합니다.
+    """
+
+    def __init__(
+        self,
+        schedules,
+        make_context,
+        timezone=None,
+        jitter=PRECOMPUTE_JITTER,
+        max_workers=PRECOMPUTE_WORKERS,
+        report_limit=PRECOMPUTE_REPORT_LIMIT,
+        poll_interval=PRECOMPUTE_POLL_INTERVAL,
+        retry_interval=PRECOMPUTE_RETRY_INTERVAL,
+        retry_limit=PRECOMPUTE_RETRY_LIMIT,
+    ):
+        self.schedules = schedules
+        self.make_context = make_context
+        self.timezone = timezone or zoneinfo.ZoneInfo(PRECOMPUTE_TIMEZONE)
+        self.jitter = jitter
+        self.report_limit = report_limit
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.retry_limit = retry_limit
+        self._users = {}
+        self._history = deque(maxlen=50)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="precompute"
+        )
+        self.schedules.sync()
+        for user_id, schedule in self.schedules.items():
+            self._users[user_id] = self._make_entry(user_id, schedule)
+        threading.Thread(
+            target=self._loop, name="precompute-scheduler", daemon=True
+        ).start()
+
+    def _make_entry(self, user_id, schedule):
+        return {
+            "schedule": schedule,
+            "context": self.make_context(user_id),
+            "next_run_at": self.get_next_run_at(schedule["time"]),
+            "retries": 0,
+        }
+
+    def update(self, user_id, schedule):
+        """사용자의 실행 일정을 등록하거나 바꿉니다. schedule이 None이면 등록을 취소합니다.
+
+        일정이 바뀐 경우에만 저장소에 저장하고 백그라운드용 컨텍스트를 만듭니다.
+        """
+        with self._lock:
+            current = self._users.get(user_id)
+            if schedule is None:
+                self._users.pop(user_id, None)
+                self.schedules.delete([user_id])
+                return
+            if current is not None and current["schedule"] == schedule:
+                return
+            self.schedules.put(user_id, schedule)
+            self._users[user_id] = self._make_entry(user_id, schedule)
+        self._wakeup.set()
+
+    def get_next_run_at(self, execution_time, now=None):
+        """다음 실행 시각 (timestamp). 설정 시각에 0~jitter초의 무작위 지연을 더합니다.
+
+        설정 시각은 self.timezone의 시각으로 해석합니다.
+        """
+        now = now or datetime.datetime.now(self.timezone)
+        hour, minute = map(int, execution_time.split(":")[:2])
+        run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += datetime.timedelta(days=1)
+        return run_at.timestamp() + random.uniform(0, self.jitter)
+
+    def get_status(self):
+        """등록된 사용자별 다음 실행 시각과 최근 실행 결과를 반환합니다."""
+        with self._lock:
+            return {
+                "scheduled": {
+                    user_id: datetime.datetime.fromtimestamp(
+                        entry["next_run_at"], self.timezone
+                    ).isoformat(timespec="seconds")
+                    for user_id, entry in self._users.items()
+                },
+                "recent": list(self._history),
+            }
+
+    def _loop(self):
+        while True:
+            now = time.time()
+            with self._lock:
+                due = [
+                    (user_id, entry)
+                    for user_id, entry in self._users.items()
+                    if entry["next_run_at"] <= now
+                ]
+                for _, entry in due:
+                    entry["next_run_at"] = self.get_next_run_at(
+                        entry["schedule"]["time"],
+                        datetime.datetime.fromtimestamp(now, self.timezone)
+                        + datetime.timedelta(minutes=1),
+                    )
+                next_run_at = min(
+                    (entry["next_run_at"] for entry in self._users.values()),
+                    default=now + self.poll_interval,
+                )
+            for user_id, entry in due:
+                self._executor.submit(self._run, user_id, entry)
+            # 일정이 바뀌면 바로 깨어나고, 그 외에는 다음 실행 시각까지 대기
+            self._wakeup.wait(
+                timeout=min(max(next_run_at - now, 0), self.poll_interval)
+            )
+            self._wakeup.clear()
+
+    def _run(self, user_id, entry):
+        context = entry["context"]
+        result = {
+            "user_id": user_id,
+            "started_at": datetime.datetime.now(self.timezone).isoformat(
+                timespec="seconds"
+            ),
+        }
+        try:
+            with context.span_metrics.span("precompute"):
+                history = context.db_handler.refresh_keywords_searched()
+                if self._is_waiting_for_backend(user_id, entry, history):
+                    result["status"] = "waiting"
+                else:
+                    result["reports"] = self._warm_reports(context, history)
+                    result["status"] = "done"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        with self._lock:
+            self._history.append(result)
+
+    def _is_waiting_for_backend(self, user_id, entry, history):
+        """백엔드의 자동 검색이 끝나지 않아 오늘 기록이 없으면 다시 확인하도록 예약합니다.
+
+        다시 확인할 횟수가 남아 있으면 True를 반환합니다.
+        """
+        dates = history.get_date_counts("keywords").index
+        today = datetime.datetime.now(self.timezone).date().isoformat()
+        with self._lock:
+            if len(dates) and dates[0] >= today:
+                entry["retries"] = 0
+                return False
+            if entry["retries"] >= self.retry_limit:
+                entry["retries"] = 0
+                return False
+            if self._users.get(user_id) is entry:
+                entry["retries"] += 1
+                entry["next_run_at"] = time.time() + self.retry_interval
+        self._wakeup.set()
+        return True
+
+    def _warm_reports(self, context, history):
+        """최근 날짜의 키워드마다 키워드 하나를 선택했을 때의 보고서를 미리 작성합니다.
+
+        보고서 작업 관리자에 캐시 키를 작업 키로 제출하므로, 여러 사용자가 같은 보고서를
+        동시에 미리 작성하려 해도 한 번만 작성하고 이미 캐시에 있는 보고서는 건너뜁니다.
+        """
+        date_counts = history.get_date_counts("keywords")
+        if date_counts.empty:
+            return 0
+        warmed = 0
+        for item in history.get_items("keywords", date_counts.index[0])[
+            : self.report_limit
+        ]:
+            # 화면에서 선택했을 때와 같은 항목을 사용해야 같은 캐시 키가 됨
+            keywords, documents = history.resolve_selection(
+                [item["keyword"].get("viewCheckboxKey")], []
+            )
+            if not keywords:
+                keywords = [item["keyword"]]
+                documents = remove_duplicates(item["documents"], get_document_identity)
+            cache_key = ReportCache.get_key(keywords, documents, "makeReportNew")
+            job = context.report_jobs.submit(
+                cache_key,
+                keywords,
+                documents,
+                context.api_manager.make_report_new,
+                cache_key=cache_key,
+            )
+            if not job.is_pending():
+                continue
+            # 작업 스레드 수만큼만 보고서를 작성하도록 끝날 때까지 기다림
+            job.wait()
+            if job.status == ReportJobStatus.DONE.value:
+                warmed += 1
+        return warmed
+
+
+@st.cache_resource
+def get_precompute_scheduler():
+    """프로세스 공용 미리 계산 스케줄러
+
+    일정은 재시작 후에도 남도록 state-backend 설정과 관계없이 SQLite 저장소에 저장합니다.
+    """
+    backend = get_sqlite_state_backend(
+        str(st.secrets.get("state-backend-path", STATE_BACKEND_PATH))
+    )
+    return PrecomputeScheduler(
+        StateCollection(backend, "precompute", "schedules"),
+        SessionContext,
+        timezone=zoneinfo.ZoneInfo(
+            st.secrets.get("precompute-timezone", PRECOMPUTE_TIMEZONE)
+        ),
+    )
+
+
 def main():
-    global keyword_logs, db_handler, user_id
     localS = LocalStorage()
 
     # user 값을 query parameter 또는 localStorage에서 가져오기
@@ -649,12 +3955,74 @@ def main():
 
     user_id = query_user if query_user else "1038"
     # st.write(user_id)
-    # DB 핸들러 초기화 및 사용자 설정 가져오기
-    db_handler = DBHandler()
-    user_settings = db_handler.get_settings()
-    app_config = db_handler.get_app_config()
+    # 세션 컨텍스트 (DB 핸들러, API 클라이언트, 캐시) 초기화 및 사용자 설정 가져오기
+    context = SessionContext.from_session(user_id)
+    db_handler = context.db_handler
+    span_metrics = context.span_metrics
+    if st.secrets.get("precompute-scheduler", False):
+        # 재시작 후 첫 실행에서 저장된 일정을 불러와 스케줄러를 시작
+        get_precompute_scheduler()
+    # 서로 독립적인 초기 조회를 동시에 실행 (가장 느린 호출만큼만 기다림)
+    with span_metrics.span("startup"):
+        startup_results, startup_errors, startup_pending = fetch_concurrently(
+            {
+                "user_settings": db_handler.fetch_settings,
+                "app_config": db_handler.get_app_config,
+                "keywords_searched": db_handler.get_keywords_searched,
+            },
+            deadline=st.secrets.get("rerun-latency-budget", RERUN_LATENCY_BUDGET),
+        )
+    startup_error_labels = {
+        "user_settings": "사용자 조회 실패",
+        "app_config": "앱 설정 조회 실패",
+        "keywords_searched": "키워드 기록 조회 실패",
+    }
+    # 시간 안에 받지 못했거나 실패한 값은 마지막으로 받은 값으로 대신 그림
+    startup_fallbacks = {
+        "user_settings": db_handler.peek_settings,
+        "app_config": db_handler.peek_app_config,
+        "keywords_searched": db_handler.peek_keywords_searched,
+    }
+    stale_errors = []
+    for name, error in startup_errors.items():
+        fallback = startup_fallbacks[name]()
+        if fallback is None:
+            st.error(f"{startup_error_labels[name]}: {error}")
+            continue
+        startup_results[name] = fallback
+        stale_errors.append(f"{startup_error_labels[name]}: {error}")
+    if stale_errors:
+        st.warning(
+            "백엔드 응답이 늦거나 실패해 마지막으로 받은 데이터를 표시합니다.\n\n"
+            + "\n\n".join(stale_errors)
+        )
+    if startup_pending:
+        st.fragment(rerun_when_fetched, run_every=STALE_REFRESH_INTERVAL)(
+            list(startup_pending.values())
+        )
+
+    def show_setting_failure():
+        """저장에 실패한 설정 변경이 있으면 알리고, 해당 위젯을 되돌린 값으로 다시 그리게 합니다."""
+        setting_failure = db_handler.setting_buffer.pop_failure(user_id)
+        if setting_failure:
+            error, failed_keys = setting_failure
+            st.error(f"사용자 설정 업데이트 실패: {error}")
+            # 실패한 설정의 위젯 값을 지워 되돌린 설정 값으로 다시 그리도록 함
+            for key in failed_keys:
+                st.session_state.pop(key, None)
+
+    show_setting_failure()
+    user_settings = startup_results.get("user_settings")
+    app_config = startup_results.get("app_config")
+    if user_settings and st.secrets.get("precompute-scheduler", False):
+        get_precompute_scheduler().update(
+            user_id, get_precompute_schedule(user_settings)
+        )
+    history = startup_results.get("keywords_searched") or KeywordHistoryTables(None)
+    context.search_index.update_in_background(history)
     # KeywordLogs 초기화 (사용자 설정 전달)
-    keyword_logs = KeywordLogs(user_settings, app_config)
+    keyword_logs = KeywordLogs(context, user_settings, app_config)
+    context.keyword_logs = keyword_logs
 
     # Settings 초기화
     settings = Settings()
@@ -662,42 +4030,90 @@ def main():
     # 나머지 객체 초기화
     sources = user_settings.get("sources", []) if user_settings else []
     searchlist = SearchSourceList(sources)
-    api_manager = APIManager()
+    api_manager = context.api_manager
     response_logger = ResponseLogger()
-    keyword_display = KeywordResultDisplay()
-    display_manager = DisplayManager()
+    keyword_display = KeywordResultDisplay(context)
+    display_manager = DisplayManager(context)
 
     st.title(keyword_logs.get_app_title())
     # 페이지 로드 시 사용자 생성 확인
     # db_handler.create_user_if_needed()
     # st.json(db_handler.get_settings())
 
-    with st.sidebar:
+    is_search_per_source = bool(st.secrets.get("search-per-source", False))
+
+    def search_each_source(search_period, start_date, period_days, search_sources):
+        """소스별 검색 결과를 끝나는 대로 기록하고 검색 결과에 이어서 표시합니다.
+
+        성공한 소스 수를 반환합니다.
+        """
+        total = len(search_sources)
+        succeeded = 0
+        status = st.status(f"키워드 검색 중... (0/{total})", expanded=False)
+
+        def finished_results():
+            nonlocal total, succeeded
+            for done, (source, result, error) in enumerate(
+                api_manager.search_by_source(
+                    SearchKeywordType.MANUAL, start_date, period_days, search_sources
+                ),
+                start=1,
+            ):
+                if source is None:
+                    # 백엔드가 sources를 무시해 전체 소스 검색 결과 하나만 받은 경우
+                    total = done
+                status.update(label=f"키워드 검색 중... ({done}/{total})")
+                if error is None:
+                    succeeded += 1
+                    # 소스별 로그는 search_period 인덱스로 합쳐서 조회됨
+                    keyword_logs.add_log(
+                        data=result,
+                        type="keyword-search",
+                        search_period=search_period,
+                        source=source,
+                    )
+                    yield result
+                else:
+                    keyword_logs.add_log(
+                        error_message=f"{source}: {error}",
+                        type="keyword-search",
+                        search_period=search_period,
+                        source=source,
+                    )
+                    with status:
+                        st.write(f"⚠️ {source}: {error}")
+
+        keyword_display.show_results(search_period, finished_results())
+        status.update(
+            label=f"키워드 검색 완료 ({succeeded}/{total})",
+            state="complete" if succeeded == total else "error",
+            expanded=succeeded < total,
+        )
+        return succeeded
+
+    def show_settings_tab(*settings_types):
+        # 탭만 다시 실행될 때도 저장 실패를 알리고 방금 바꾼 설정이 보이도록 캐시된 설정을 다시 읽음
+        show_setting_failure()
+        keyword_logs.refresh_user_settings()
+        for settings_type in settings_types:
+            setting = keyword_logs.get_setting(settings_type)
+            if setting:
+                display_manager.show_settings(setting, settings_type)
+
+    with st.sidebar, span_metrics.span("render:sidebar"):
         sidebar_top_container = st.sidebar.container()
         sidebar_bottom_container = st.sidebar.container()
 
         with sidebar_bottom_container:
             with st.sidebar.expander("Settings", expanded=False):
                 tab1, tab3 = st.tabs(["매일 키워드", "키워드 수동 검색"])
+                # 설정 탭은 각각 프래그먼트로, 설정을 바꾸면 해당 탭만 다시 실행됨
                 with tab1:
-                    auto_cron_setting = keyword_logs.get_setting(SettingsType.AUTO_CRON)
-                    if auto_cron_setting:
-                        display_manager.show_settings(
-                            auto_cron_setting, SettingsType.AUTO_CRON
-                        )
-                    auto_keyword_setting = keyword_logs.get_setting(
-                        SettingsType.AUTO_KEYWORD
+                    st.fragment(show_settings_tab)(
+                        SettingsType.AUTO_CRON, SettingsType.AUTO_KEYWORD
                     )
-                    if auto_keyword_setting:
-                        display_manager.show_settings(
-                            auto_keyword_setting, SettingsType.AUTO_KEYWORD
-                        )
                 with tab3:
-                    keyword_setting = keyword_logs.get_setting(SettingsType.KEYWORD)
-                    if keyword_setting:
-                        display_manager.show_settings(
-                            keyword_setting, SettingsType.KEYWORD
-                        )
+                    st.fragment(show_settings_tab)(SettingsType.KEYWORD)
 
         with sidebar_top_container:
             st.session_state["button_text"] = settings.get_search_button_text()
@@ -710,28 +4126,44 @@ def main():
                     search_period = settings.get_search_period()
                     try:
                         # 검색 버튼과 실행
-                        selected_sources = searchlist.get_checked_sources(
-                            TaskType.KEYWORD
-                        )
-                        selected_aliases = [source for source in selected_sources]
                         # hi = keyword_logs.get_date_select_and_option()
                         # st.write(hi)
                         start_date, period_days = (
                             keyword_logs.get_date_select_and_option()
                         )
+                        # 검색은 서버에 저장된 설정을 사용하므로 대기 중인 변경을 먼저 저장
+                        db_handler.flush_setting_updates(user_id)
 
-                        result = api_manager.search(
-                            SearchKeywordType.MANUAL,
-                            start_date=start_date.strftime("%Y-%m-%d"),
-                            period_days=period_days,
+                        search_sources = keyword_logs.get_selected_sources(
+                            SettingsType.KEYWORD
                         )
+                        if (
+                            is_search_per_source
+                            and search_sources is not None
+                            and len(search_sources) > 1
+                            and api_manager.is_source_search_supported() is not False
+                        ):
+                            if search_each_source(
+                                search_period,
+                                start_date.strftime("%Y-%m-%d"),
+                                period_days,
+                                search_sources,
+                            ):
+                                keyword_logs.add_searched_period(search_period)
+                        else:
+                            result = api_manager.search(
+                                SearchKeywordType.MANUAL,
+                                start_date=start_date.strftime("%Y-%m-%d"),
+                                period_days=period_days,
+                                sources=search_sources,
+                            )
 
-                        keyword_logs.add_log(
-                            data=result,
-                            type="keyword-search",
-                            search_period=search_period,
-                        )
-                        keyword_logs.add_searched_period(search_period)
+                            keyword_logs.add_log(
+                                data=result,
+                                type="keyword-search",
+                                search_period=search_period,
+                            )
+                            keyword_logs.add_searched_period(search_period)
                     except Exception as e:
                         keyword_logs.add_log(
                             error_message=str(e),
@@ -755,80 +4187,52 @@ def main():
 
     # 최신 로그 데이터 확인 및 결과 표시
     searched_periods = keyword_logs.get_searched_periods()
-    selected_keywords = keyword_logs.get_selected_keywords()
+    # 사이드바의 "보고서 작성" 버튼은 선택한 키워드가 있을 때만 표시됨
+    has_sidebar_report_button = len(keyword_logs.get_selected_keywords()) > 0
 
-    def remove_duplicates(data):
-        """리스트에서 중복된 딕셔너리를 제거하는 함수"""
-        unique_data = []
-        for item in data:
-            if item not in unique_data:
-                unique_data.append(item)
-        return unique_data
+    report_jobs = context.report_jobs
+    is_report_streaming = bool(st.secrets.get("report-streaming", True))
+    report_display = ReportJobDisplay(report_jobs)
 
-    col1, col2 = st.columns([3, 5])
-    report_response = None
-    with col1:
+    def show_selection_panel(history):
+        """선택한 키워드/뉴스 요약과 날짜별 기록을 표시합니다.
 
+        프래그먼트로 실행되므로 체크박스를 바꾸면 이 영역만 다시 실행됩니다.
+        """
+        # 선택이 비거나 처음 생기면 사이드바 버튼도 바뀌어야 하므로 앱 전체를 다시 실행
+        if (len(keyword_logs.get_selected_keywords()) > 0) != has_sidebar_report_button:
+            st.rerun(scope="app")
         col1_top_container = st.container()
         col1_bottom_container = st.container()
-        keywords_searched = db_handler.get_keywords_searched()
-        selected_keywords = remove_duplicates(
-            [
-                *[
-                    item["keyword"]
-                    for item in [
-                        v
-                        for k, v in keywords_searched["data"]["viewKeyMap"][
-                            "keywordKeyMap"
-                        ].items()
-                        if st.session_state.get(k, False)
-                    ]
-                ],
-                *[
-                    item["keyword"]
-                    for item in [
-                        v
-                        for k, v in keywords_searched["data"]["viewKeyMap"][
-                            "documentKeyMap"
-                        ].items()
-                        if st.session_state.get(k, False)
-                    ]
-                ],
-            ]
-        )
-        selected_news = remove_duplicates(
-            [
-                *[
-                    page
-                    for item in [
-                        v
-                        for k, v in keywords_searched["data"]["viewKeyMap"][
-                            "keywordKeyMap"
-                        ].items()
-                        if st.session_state.get(k, False)
-                    ]
-                    for page in item["documents"]
-                ],
-                *[
-                    item["document"]
-                    for item in [
-                        v
-                        for k, v in keywords_searched["data"]["viewKeyMap"][
-                            "documentKeyMap"
-                        ].items()
-                        if st.session_state.get(k, False)
-                    ]
-                ],
-            ]
-        )
-        with col1_top_container:
+        with col1_top_container, span_metrics.span("render:selection_summary"):
+            selected_keywords, selected_news = keyword_logs.get_selected_items(history)
             report_button = st.button("보고서 작성", key="report_button")
+            regenerate_report = st.checkbox(
+                "다시 작성",
+                key="report_regenerate",
+                help="저장된 보고서를 사용하지 않고 새로 작성합니다.",
+            )
             if report_button and len(selected_keywords) > 0:
-                st.write("보고서 작성 중...")
-                report_response = api_manager.make_report_new(
+                report_job = report_jobs.submit(
+                    ReportJobManager.get_job_key(
+                        context.user_id, selected_keywords, selected_news
+                    ),
                     selected_keywords,
                     selected_news,
+                    (
+                        api_manager.stream_report_new
+                        if is_report_streaming
+                        else api_manager.make_report_new
+                    ),
+                    streaming=is_report_streaming,
+                    cache_key=ReportCache.get_key(
+                        selected_keywords, selected_news, "makeReportNew"
+                    ),
+                    regenerate=regenerate_report,
                 )
+                st.session_state["report_job_id"] = report_job.job_id
+                # 보고서 영역은 이 프래그먼트 밖에 있으므로 전체를 다시 실행
+                st.rerun()
             else:
                 st.write("키워드를 선택해주세요.")
 
@@ -851,18 +4255,17 @@ def main():
                     unsafe_allow_html=True,
                 )
             st.divider()
-        with col1_bottom_container:
+        with col1_bottom_container, span_metrics.span("render:keywords_searched"):
             st.write("날짜별 키워드")
 
-            display_manager.show_keywords_searched(
-                keywords_searched["data"]["keywords"],
-                keywords_searched["data"]["documents"],
-            )
+            display_manager.show_keywords_searched(history)
 
-    with col2:
+    col1, col2 = st.columns([3, 5])
+    with col1:
+        st.fragment(show_selection_panel)(history)
 
-        if report_response:
-            st.markdown(report_response["data"])
+    with col2, span_metrics.span("render:report"):
+        report_display.show_report(st.session_state.get("report_job_id"))
 
     with st.sidebar:
         logs = keyword_logs.get_logs()
@@ -871,4 +4274,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    span_metrics = get_span_metrics()
+    with span_metrics.rerun() as rerun_spans:
+        main()
+    if st.secrets.get("performance-panel", False) or st.query_params.get("perf"):
+        PerformancePanel(span_metrics).show(rerun_spans)
@@ -0,0 +1,308 @@
+"""기록 크기별 화면 재실행(rerun) 성능 측정
+
+mock_server 로 만든 getKeywordsSearched 기록(날짜 x 키워드 x 뉴스)을 크기별로 띄우고,
+Streamlit AppTest 로 app.py 를 화면 없이 실행하면서 주요 동작마다
+실행 시간, 그려진 요소/위젯 수, 백엔드 호출 수, 최대 메모리 사용량을 기록합니다.
+
+    python benchmark.py --sizes 7x10x3 30x10x3 90x20x5 --repeat 3 \\
+        --output benchmark-results.json
+
+측정하는 동작:
+    first_load      캐시가 빈 상태의 첫 화면
+    warm_load       캐시가 채워진 상태에서 새 세션의 첫 화면
+    open_date       Keyword 탭의 최근 날짜 펼치기
+    toggle_keyword  키워드 선택/해제
+    toggle_source   설정의 검색 소스 선택/해제
+    generate_report 보고서 작성 버튼부터 본문이 표시될 때까지
+
+AppTest 는 프래그먼트 안의 위젯 변경도 전체 스크립트를 다시 실행하므로,
+프래그먼트로 나뉜 동작(toggle_keyword, toggle_source)의 값은 상한값입니다.
+
+mock 서버는 별도 프로세스로 실행하여 응답 생성 부하가 측정에 섞이지 않게 하고,
+tracemalloc 이 실행 시간을 늘리므로 최대 메모리는 시간 측정 뒤 한 번 더 실행하여 따로 측정합니다.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import requests
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block, Widget
+
+APP_PATH = Path(__file__).parent / "app.py"
+MOCK_SERVER_PATH = Path(__file__).parent / "mock_server.py"
+DEFAULT_SIZES = ["7x10x3", "30x10x3", "90x20x5"]
+RUN_TIMEOUT = 60
+MOCK_STATS_TIMEOUT = 10
+# 보고서가 표시될 때까지 다시 실행하는 간격과 제한 시간 (초)
+REPORT_POLL_INTERVAL = 0.1
+REPORT_TIMEOUT = 60
+
+
+def parse_size(text):
+    """'30x10x3' 을 (날짜 수, 날짜별 키워드 수, 키워드별 뉴스 수) 로 변환합니다."""
+    days, keywords, documents = (int(part) for part in text.lower().split("x"))
+    return {"days": days, "keywords": keywords, "documents": documents}
+
+
+class MockServerProcess:
+    """mock_server.py 를 별도 프로세스로 실행하고 호출 통계를 HTTP로 읽습니다."""
+
+    def __init__(self, size, latency):
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-u",
+                str(MOCK_SERVER_PATH),
+                "--port",
+                "0",
+                "--days",
+                str(size["days"]),
+                "--keywords",
+                str(size["keywords"]),
+                "--documents",
+                str(size["documents"]),
+                "--latency",
+                latency,
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        # 기록을 만든 뒤 "mock backend: <base_url> ..." 을 출력하면 준비된 것
+        line = self.process.stdout.readline()
+        if not line.startswith("mock backend: "):
+            self.close()
+            raise RuntimeError(f"mock 서버를 시작하지 못했습니다: {line!r}")
+        self.base_url = line.split()[2]
+
+    def get_stats(self):
+        response = requests.get(f"{self.base_url}/__stats", timeout=MOCK_STATS_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def get_latest_date(self):
+        return self.get_stats()["latestDate"]
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait()
+        self.process.stdout.close()
+
+
+class Recorder:
+    """동작 하나의 실행 시간, 요소 수, 백엔드 호출 수, 최대 메모리를 측정합니다."""
+
+    def __init__(self, backend, trace_memory=True):
+        self.backend = backend
+        self.trace_memory = trace_memory
+
+    def measure(self, at, action):
+        calls_before = self.backend.get_stats()["calls"]
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        reruns = action()
+        wall_ms = (time.perf_counter() - started) * 1000
+        peak_kb = (
+            tracemalloc.get_traced_memory()[1] / 1024 if self.trace_memory else None
+        )
+        calls_after = self.backend.get_stats()["calls"]
+
+        nodes = [node for node in at._tree if not isinstance(node, Block)]
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        return {
+            "wall_ms": round(wall_ms, 2),
+            "reruns": reruns,
+            "elements": len(nodes),
+            "widgets": sum(isinstance(node, Widget) for node in nodes),
+            "backend_calls": {
+                endpoint: count - calls_before.get(endpoint, 0)
+                for endpoint, count in calls_after.items()
+                if count != calls_before.get(endpoint, 0)
+            },
+            "peak_memory_kb": round(peak_kb, 1) if peak_kb is not None else None,
+        }
+
+
+def new_app(base_url):
+    at = AppTest.from_file(str(APP_PATH), default_timeout=RUN_TIMEOUT)
+    for name in ("keyword-finder-url", "report-maker-url", "app-manager-url"):
+        at.secrets[name] = base_url
+    at.secrets["db-handler-url"] = base_url + "/"
+    # LocalStorage 컴포넌트는 브라우저 응답을 기다리므로 초기화된 것으로 설정
+    at.session_state["storage_init"] = {}
+    return at
+
+
+def run_once(at):
+    at.run()
+    return 1
+
+
+def find_checkbox(at, predicate):
+    return next(c for c in at.checkbox if c.key and predicate(c.key))
+
+
+def run_scenario(base_url, latest_date, recorder):
+    """동작을 차례로 실행하고 {동작 이름: 측정값} 을 반환합니다."""
+    samples = {}
+    # 공유 캐시(설정, 기록, 검색 결과, 보고서 작업)를 비운 상태에서 시작
+    st.cache_resource.clear()
+
+    at = new_app(base_url)
+    samples["first_load"] = recorder.measure(at, lambda: run_once(at))
+
+    at = new_app(base_url)
+    samples["warm_load"] = recorder.measure(at, lambda: run_once(at))
+
+    toggle = at.toggle(key=f"history_open_keyword_{latest_date}")
+    samples["open_date"] = recorder.measure(
+        at, lambda: run_once(toggle.set_value(True))
+    )
+
+    keyword = find_checkbox(at, lambda key: key.startswith("VIEW#"))
+    samples["toggle_keyword"] = recorder.measure(at, lambda: run_once(keyword.check()))
+
+    source = find_checkbox(at, lambda key: "#SOURCE_" in key)
+    samples["toggle_source"] = recorder.measure(
+        at, lambda: run_once(source.set_value(not source.value))
+    )
+
+    def generate_report():
+        # 디스크 보고서 캐시를 거치지 않도록 다시 작성으로 요청
+        at.checkbox(key="report_regenerate").check()
+        at.button(key="report_button").click().run()
+        reruns = 1
+        deadline = time.monotonic() + REPORT_TIMEOUT
+        while not any("보고서" in m.value for m in at.markdown):
+            if time.monotonic() > deadline:
+                raise RuntimeError("보고서가 제한 시간 안에 표시되지 않았습니다.")
+            time.sleep(REPORT_POLL_INTERVAL)
+            at.run()
+            reruns += 1
+        return reruns
+
+    samples["generate_report"] = recorder.measure(at, generate_report)
+    return samples
+
+
+def summarize(samples, memory_sample=None):
+    wall = [sample["wall_ms"] for sample in samples]
+    return {
+        "median_wall_ms": round(statistics.median(wall), 2),
+        "max_wall_ms": max(wall),
+        "elements": samples[-1]["elements"],
+        "widgets": samples[-1]["widgets"],
+        "peak_memory_kb": memory_sample["peak_memory_kb"] if memory_sample else None,
+    }
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=DEFAULT_SIZES,
+        metavar="DAYSxKEYWORDSxDOCUMENTS",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="mock 백엔드 응답 지연 분포 (mock_server.py 형식)",
+    )
+    parser.add_argument(
+        "--no-tracemalloc",
+        action="store_true",
+        help="메모리 측정 실행을 건너뛰고 실행 시간만 측정",
+    )
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    trace_memory = not args.no_tracemalloc
+
+    results = []
+    for size_text in args.sizes:
+        size = parse_size(size_text)
+        backend = MockServerProcess(size, args.latency)
+        try:
+            latest_date = backend.get_latest_date()
+            recorder = Recorder(backend, trace_memory=False)
+            runs = [
+                run_scenario(backend.base_url, latest_date, recorder)
+                for _ in range(args.repeat)
+            ]
+            memory_run = None
+            if trace_memory:
+                tracemalloc.start()
+                try:
+                    memory_run = run_scenario(
+                        backend.base_url, latest_date, Recorder(backend)
+                    )
+                finally:
+                    tracemalloc.stop()
+        finally:
+            backend.close()
+
+        for interaction in runs[0]:
+            samples = [run[interaction] for run in runs]
+            results.append(
+                {
+                    "size": size,
+                    "interaction": interaction,
+                    **summarize(
+                        samples, memory_run[interaction] if memory_run else None
+                    ),
+                    "samples": samples,
+                }
+            )
+            print(
+                f"{size_text:>12} {interaction:<16} "
+                f"{results[-1]['median_wall_ms']:>9.1f} ms "
+                f"elements={results[-1]['elements']:<6} "
+                f"calls={sum(samples[-1]['backend_calls'].values())}",
+                file=sys.stderr,
+            )
+
+    report = {
+        "meta": {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "repeat": args.repeat,
+            "latency": args.latency,
+            "tracemalloc": trace_memory,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
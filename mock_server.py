@@ -0,0 +1,752 @@
+"""app-manager / db-handler 엔드포인트를 흉내 내는 로컬 서버
+
+실제 백엔드 없이 앱을 실행하거나, 응답 지연과 오류 비율을 조절하여
+오프라인 성능/장애 대응 테스트를 할 때 사용합니다.
+
+    python mock_server.py --port 8600 --days 60 --keywords 20 --documents 5 \\
+        --latency lognormal:80:0.5 \\
+        --latency /makeReportNew=uniform:2000:6000 \\
+        --error-rate /getKeywordsSearched=0.05
+
+.streamlit/secrets.toml 에서 모든 URL을 이 서버로 지정합니다.
+
+    keyword-finder-url = "http://127.0.0.1:8600"
+    report-maker-url = "http://127.0.0.1:8600"
+    app-manager-url = "http://127.0.0.1:8600"
+    db-handler-url = "http://127.0.0.1:8600/"
+
+지연 분포 형식 (단위 ms):
+    fixed:MS, uniform:LO:HI, normal:MEAN:STD, lognormal:MEDIAN:SIGMA, exp:MEAN
+
+GET /__stats 는 엔드포인트별 호출/오류 수를, POST /__reset 은 카운터 초기화를 합니다.
+"""
+
+import argparse
+import copy
+import datetime
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_USER_ID = 1038
+DEFAULT_APP_TITLE = "Construction Insights (mock)"
+
+# 고정 크기 fixture 의 기본값
+DEFAULT_DAYS = 30
+DEFAULT_KEYWORDS_PER_DAY = 10
+DEFAULT_DOCUMENTS_PER_KEYWORD = 3
+DEFAULT_SEARCH_RESULTS = 10
+
+# 보고서 스트리밍 조각 수와 조각 사이 간격 (초)
+REPORT_STREAM_CHUNKS = 20
+REPORT_STREAM_INTERVAL = 0.05
+
+KEYWORD_WORDS = [
+    ("modular construction", "모듈러 건설"),
+    ("construction cost index", "건설 공사비 지수"),
+    ("smart construction", "스마트 건설"),
+    ("building information modeling", "건설정보모델링"),
+    ("construction safety", "건설 안전"),
+    ("carbon neutral building", "탄소중립 건축"),
+    ("tariffs", "관세"),
+    ("workforce shortage", "인력 부족"),
+    ("housing supply", "주택 공급"),
+    ("infrastructure investment", "인프라 투자"),
+    ("construction robotics", "건설 로봇"),
+    ("precast concrete", "프리캐스트 콘크리트"),
+    ("green remodeling", "그린 리모델링"),
+    ("project financing", "프로젝트 파이낸싱"),
+    ("overseas construction", "해외 건설"),
+    ("digital twin", "디지털 트윈"),
+    ("steel prices", "철강 가격"),
+    ("nuclear power plant", "원자력 발전소"),
+    ("data center construction", "데이터센터 건설"),
+    ("urban regeneration", "도시 재생"),
+]
+
+SOURCES = [
+    ("ENR", "https://www.enr.com"),
+    ("Construction Dive", "https://www.constructiondive.com"),
+    ("For Construction Pros", "https://www.forconstructionpros.com"),
+    ("대한건설협회", "https://www.cak.or.kr"),
+    ("국토교통부", "https://www.molit.go.kr"),
+    ("건설경제", "https://www.cnews.co.kr"),
+]
+
+
+class LatencyProfile:
+    """엔드포인트별 응답 지연 분포"""
+
+    def __init__(self, default="fixed:0", overrides=None):
+        self.default = self.parse(default)
+        self.overrides = {
+            endpoint: self.parse(spec) for endpoint, spec in (overrides or {}).items()
+        }
+
+    @staticmethod
+    def parse(spec):
+        """'lognormal:80:0.5' 같은 문자열을 (분포 이름, 인자) 로 변환합니다."""
+        name, *args = str(spec).split(":")
+        if name.replace(".", "", 1).isdigit():
+            name, args = "fixed", [name]
+        args = [float(arg) for arg in args]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+        if expected.get(name) != len(args):
+            raise ValueError(f"지연 분포 형식 오류: {spec}")
+        return name, args
+
+    def sample(self, endpoint, rng=random):
+        """지연 시간(초)을 하나 뽑습니다."""
+        name, args = self.overrides.get(endpoint, self.default)
+        if name == "fixed":
+            ms = args[0]
+        elif name == "uniform":
+            ms = rng.uniform(*args)
+        elif name == "normal":
+            ms = rng.gauss(*args)
+        elif name == "lognormal":
+            median, sigma = args
+            ms = median * rng.lognormvariate(0, sigma)
+        else:
+            ms = rng.expovariate(1 / args[0]) if args[0] > 0 else 0
+        return max(ms, 0) / 1000
+
+
+class FailureProfile:
+    """엔드포인트별 오류 응답 비율과 상태 코드"""
+
+    def __init__(self, default=0.0, overrides=None, status=503):
+        self.default = default
+        self.overrides = overrides or {}
+        self.status = status
+
+    def should_fail(self, endpoint, rng=random):
+        return rng.random() < self.overrides.get(endpoint, self.default)
+
+
+def get_view_key(date, *parts):
+    return "#".join(["VIEW", "DATE", date, *parts])
+
+
+def slugify(text):
+    return "_".join(text.lower().split())
+
+
+def make_keyword(rng, date, index):
+    en, ko = KEYWORD_WORDS[index % len(KEYWORD_WORDS)]
+    # 단어 목록보다 많이 요청하면 번호를 붙여 고유하게 만듦
+    round_ = index // len(KEYWORD_WORDS)
+    if round_:
+        en, ko = f"{en} {round_ + 1}", f"{ko} {round_ + 1}"
+    return {
+        "en": en,
+        "ko": ko,
+        "viewLabel": f"{ko} ({en})",
+        "viewCheckboxKey": get_view_key(date, "KEYWORD", slugify(en)),
+        "score": round(rng.uniform(0.3, 1.0), 4),
+    }
+
+
+def make_document(rng, date, keyword, index):
+    source_name, source_url = SOURCES[index % len(SOURCES)]
+    slug = slugify(keyword["en"])
+    title = f"[{source_name}] {keyword['ko']} 관련 동향 {date} #{index + 1}"
+    return {
+        "url": f"{source_url}/news/{date}/{slug}/{index}",
+        "title": title,
+        "titleShort": title[:40],
+        "source": source_name,
+        "content": " ".join(
+            f"{keyword['ko']} 시장은 {rng.randint(1, 30)}% 변화했으며 "
+            f"{source_name}은(는) {rng.choice(KEYWORD_WORDS)[1]}와의 연관성을 언급했다."
+            for _ in range(3)
+        ),
+    }
+
+
+def make_history_day(date, keywords_per_day, documents_per_keyword, seed=0):
+    """하루치 getKeywordsSearched 데이터 (keywords, documents, viewKeyMap 조각) 를 만듭니다."""
+    rng = random.Random(f"{seed}:{date}")
+    keywords, documents = [], []
+    keyword_key_map, document_key_map = {}, {}
+    for k in range(keywords_per_day):
+        keyword = make_keyword(rng, date, k)
+        keyword_documents = [
+            make_document(rng, date, keyword, d) for d in range(documents_per_keyword)
+        ]
+        keywords.append({"keyword": keyword, "documents": keyword_documents})
+        keyword_key_map[keyword["viewCheckboxKey"]] = {
+            "keyword": keyword,
+            "documents": keyword_documents,
+        }
+        for d, document in enumerate(keyword_documents):
+            document_keyword = {
+                **keyword,
+                "viewCheckboxKey": get_view_key(
+                    date, "DOCUMENT", f"{k}-{d}", "KEYWORD", slugify(keyword["en"])
+                ),
+            }
+            documents.append({**document, "keywords": [document_keyword]})
+            document_key_map[document_keyword["viewCheckboxKey"]] = {
+                "document": document,
+                "keyword": keyword,
+            }
+    return keywords, documents, keyword_key_map, document_key_map
+
+
+def make_keyword_history(
+    days=DEFAULT_DAYS,
+    keywords_per_day=DEFAULT_KEYWORDS_PER_DAY,
+    documents_per_keyword=DEFAULT_DOCUMENTS_PER_KEYWORD,
+    end_date=None,
+    seed=0,
+):
+    """end_date까지 days일 x keywords_per_day x documents_per_keyword 크기의 기록을 만듭니다."""
+    end_date = end_date or datetime.date.today()
+    history = KeywordHistory(keywords_per_day, documents_per_keyword, seed)
+    for offset in range(days - 1, -1, -1):
+        history.add_day(end_date - datetime.timedelta(days=offset))
+    return history
+
+
+class KeywordHistory:
+    """날짜별 키워드 기록. since 이후 날짜만 잘라 증분 응답을 만들 수 있습니다."""
+
+    def __init__(self, keywords_per_day, documents_per_keyword, seed=0):
+        self.keywords_per_day = keywords_per_day
+        self.documents_per_keyword = documents_per_keyword
+        self.seed = seed
+        self.days = {}
+        self.lock = threading.Lock()
+
+    def add_day(self, date):
+        date = str(date)
+        day = make_history_day(
+            date, self.keywords_per_day, self.documents_per_keyword, self.seed
+        )
+        with self.lock:
+            self.days[date] = day
+        return date
+
+    def get_latest_date(self):
+        with self.lock:
+            return max(self.days) if self.days else None
+
+    def get_response(self, since=None):
+        with self.lock:
+            dates = sorted(self.days)
+            latest = dates[-1] if dates else None
+            if since is not None and latest is not None and since > latest:
+                # 클라이언트 커서가 서버 기록보다 앞서 있으면 전체를 다시 받게 함
+                return {"data": {"resync": True, "cursor": latest}}
+            if since is not None:
+                dates = [date for date in dates if date >= since]
+            data = {
+                "keywords": {},
+                "documents": {},
+                "viewKeyMap": {"keywordKeyMap": {}, "documentKeyMap": {}},
+                "cursor": latest,
+            }
+            for date in dates:
+                keywords, documents, keyword_key_map, document_key_map = self.days[date]
+                data["keywords"][date] = keywords
+                data["documents"][date] = documents
+                data["viewKeyMap"]["keywordKeyMap"].update(keyword_key_map)
+                data["viewKeyMap"]["documentKeyMap"].update(document_key_map)
+        if since is not None:
+            data["isDelta"] = True
+        return {"data": data}
+
+
+def make_sources(count, prefix):
+    return [
+        {
+            "name": name,
+            "url": url,
+            "alias": slugify(name),
+            "checkboxKey": f"{prefix}_{slugify(name)}",
+            "isSelect": i % 2 == 0,
+            "groupId": None,
+        }
+        for i, (name, url) in enumerate(SOURCES[:count])
+    ]
+
+
+def make_settings(user_id=DEFAULT_USER_ID, source_count=len(SOURCES)):
+    """getSettings 응답을 만듭니다."""
+    return {
+        "data": {
+            "viewSettings": [
+                {
+                    "settingType": "auto-cron",
+                    "userId": user_id,
+                    "autoDaily": {
+                        "executionStatusLabel": "매일 자동 실행",
+                        "executionStatus": False,
+                        "executionStatusKey": "AUTO_CRON#STATUS",
+                        "executionTimeLabel": "실행 시간",
+                        "executionTime": "08:00",
+                        "executionTimeKey": "AUTO_CRON#TIME",
+                    },
+                },
+                {
+                    "settingType": "auto-keyword",
+                    "userId": user_id,
+                    "sources": make_sources(source_count, "AUTO_KEYWORD#SOURCE"),
+                },
+                {
+                    "settingType": "keyword",
+                    "userId": user_id,
+                    "dateSelectLabel": "검색 시작일",
+                    "dateSelectKey": "KEYWORD#DATE",
+                    "dateOptionLabel": "검색 기간",
+                    "dateOptionKey": "KEYWORD#PERIOD",
+                    "dateOptionMap": {"1일": 1, "3일": 3, "1주일": 7, "1개월": 30},
+                    "sources": make_sources(source_count, "KEYWORD#SOURCE"),
+                },
+            ]
+        }
+    }
+
+
+def apply_setting_update(user_settings, key, value):
+    """updateSetting 요청을 설정에 반영합니다. 반영할 위치를 찾았으면 True를 반환합니다."""
+    for setting in user_settings["data"]["viewSettings"]:
+        auto_daily = setting.get("autoDaily") or {}
+        owned_keys = {
+            auto_daily.get("executionStatusKey"),
+            auto_daily.get("executionTimeKey"),
+            *(source.get("checkboxKey") for source in setting.get("sources", [])),
+        }
+        if key in owned_keys:
+            merge_setting_value(setting, value)
+            return True
+    return False
+
+
+def merge_setting_value(target, value):
+    for field, new_value in value.items():
+        current = target.get(field)
+        if isinstance(current, dict) and isinstance(new_value, dict):
+            merge_setting_value(current, new_value)
+        elif isinstance(current, list) and isinstance(new_value, list):
+            for item in new_value:
+                match = next(
+                    (
+                        c
+                        for c in current
+                        if c.get("checkboxKey") == item.get("checkboxKey")
+                    ),
+                    None,
+                )
+                if match is None:
+                    current.append(item)
+                else:
+                    merge_setting_value(match, item)
+        else:
+            target[field] = new_value
+
+
+def make_search_result(
+    request, result_count=DEFAULT_SEARCH_RESULTS, seed=0, search_sources=True
+):
+    """searchKeyword 응답을 만듭니다. 같은 요청에는 같은 결과를 반환합니다.
+
+    요청의 sources(alias 목록)가 있으면 그 소스만 검색하고 응답의 sources로 돌려줍니다.
+    search_sources가 False이면 sources를 무시하는 백엔드처럼 전체 소스를 검색합니다.
+    """
+    requested = request.get("sources") if search_sources else None
+    sources = requested or [slugify(name) for name, _ in SOURCES]
+    rng = random.Random(
+        f"{seed}:{request.get('start_date')}:{request.get('period_days')}:"
+        f"{','.join(sorted(map(str, sources)))}"
+    )
+    results = {}
+    for i in range(result_count):
+        source = sources[i % len(sources)]
+        en, _ = rng.choice(KEYWORD_WORDS)
+        results[str(i)] = {
+            "title": f"{en.title()} - {source}",
+            "url": f"https://{source}.example.com/{slugify(en)}/{i}",
+            "content": f"{en} news from {source}",
+            "score": round(rng.uniform(0.3, 1.0), 8),
+            "keywords": (
+                [en, *(w for w, _ in rng.sample(KEYWORD_WORDS, 2))]
+                if rng.random() < 0.7
+                else None
+            ),
+        }
+    if requested:
+        return {"results": results, "sources": list(requested)}
+    return {"results": results}
+
+
+def make_report_text(keywords, documents):
+    """makeReportNew 보고서 본문(markdown)을 만듭니다."""
+    names = [
+        keyword.get("ko") or keyword.get("en") if isinstance(keyword, dict) else keyword
+        for keyword in keywords
+    ] or ["건설 동향"]
+    lines = [f"# {', '.join(map(str, names[:3]))} 동향 보고서", ""]
+    for name in names:
+        lines += [f"## {name}", "", f"{name} 관련 최근 동향을 요약합니다.", ""]
+    if documents:
+        lines += ["## 참고 뉴스", ""]
+        lines += [
+            f"- [{document.get('titleShort') or document.get('title')}]({document.get('url')})"
+            for document in documents
+            if isinstance(document, dict)
+        ]
+    return "\n".join(lines)
+
+
+class MockBackend:
+    """mock 서버의 상태 (fixture, 사용자 설정, 지연/오류 프로필, 호출 통계)"""
+
+    def __init__(
+        self,
+        history=None,
+        latency=None,
+        failures=None,
+        search_results=DEFAULT_SEARCH_RESULTS,
+        app_title=DEFAULT_APP_TITLE,
+        bulk_settings=True,
+        search_sources=True,
+        seed=0,
+    ):
+        self.history = history or KeywordHistory(
+            DEFAULT_KEYWORDS_PER_DAY, DEFAULT_DOCUMENTS_PER_KEYWORD, seed
+        )
+        self.latency = latency or LatencyProfile()
+        self.failures = failures or FailureProfile()
+        self.search_results = search_results
+        self.app_title = app_title
+        self.bulk_settings = bulk_settings
+        self.search_sources = search_sources
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.settings = {}
+        self.lock = threading.Lock()
+        self.calls = Counter()
+        self.errors = Counter()
+
+    def get_settings(self, user_id):
+        with self.lock:
+            if user_id not in self.settings:
+                self.settings[user_id] = make_settings(user_id)
+            return copy.deepcopy(self.settings[user_id])
+
+    def update_setting(self, user_id, key, value):
+        with self.lock:
+            user_settings = self.settings.setdefault(user_id, make_settings(user_id))
+            return apply_setting_update(user_settings, key, value)
+
+    def record(self, endpoint, error=False):
+        with self.lock:
+            self.calls[endpoint] += 1
+            if error:
+                self.errors[endpoint] += 1
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "calls": dict(self.calls),
+                "errors": dict(self.errors),
+                "latestDate": self.history.get_latest_date(),
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.calls.clear()
+            self.errors.clear()
+
+    def sample_delay(self, endpoint):
+        with self.lock:
+            return self.latency.sample(endpoint, self.rng)
+
+    def should_fail(self, endpoint):
+        with self.lock:
+            return self.failures.should_fail(endpoint, self.rng)
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    # 보고서 스트리밍에 chunked 전송을 쓰기 위해 HTTP/1.1 사용
+    protocol_version = "HTTP/1.1"
+    backend: MockBackend = None
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PUT(self):
+        self._handle()
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        # db-handler-url 뒤의 / 유무와 관계없이 같은 엔드포인트로 처리
+        endpoint = "/" + url.path.lstrip("/")
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            request_json = json.loads(body) if body else {}
+        except ValueError:
+            return self._send_json({"error": "invalid json"}, 400)
+
+        if endpoint == "/__stats":
+            return self._send_json(self.backend.get_stats())
+        if endpoint == "/__reset":
+            self.backend.reset_stats()
+            return self._send_json({"ok": True})
+
+        handler = ROUTES.get((self.command, endpoint))
+        if handler is None:
+            self.backend.record(endpoint, error=True)
+            return self._send_json({"error": f"not found: {endpoint}"}, 404)
+
+        time.sleep(self.backend.sample_delay(endpoint))
+        if self.backend.should_fail(endpoint):
+            self.backend.record(endpoint, error=True)
+            status = self.backend.failures.status
+            return self._send_json({"error": "injected failure"}, status)
+
+        self.backend.record(endpoint)
+        try:
+            handler(self, params, request_json)
+        except Exception as e:
+            self.backend.record(endpoint, error=True)
+            self._send_json({"error": str(e)}, 500)
+
+    def _send_json(self, obj, status=200):
+        payload = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_sse(self, chunks, interval=REPORT_STREAM_INTERVAL):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = [
+            f"data: {json.dumps({'delta': chunk}, ensure_ascii=False)}\n\n"
+            for chunk in chunks
+        ]
+        for event in [*events, "data: [DONE]\n\n"]:
+            payload = event.encode("utf-8")
+            self.wfile.write(f"{len(payload):X}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+            time.sleep(interval)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def get_settings(self, params, request_json):
+        user_id = int(params.get("user_id", DEFAULT_USER_ID))
+        self._send_json(self.backend.get_settings(user_id))
+
+    def get_app_config(self, params, request_json):
+        self._send_json({"data": {"title": self.backend.app_title}})
+
+    def get_keywords_searched(self, params, request_json):
+        self._send_json(self.backend.history.get_response(params.get("since")))
+
+    def get_keywords(self, params, request_json):
+        response = self.backend.history.get_response(params.get("date"))
+        data = response["data"]
+        date = params.get("date")
+        self._send_json(
+            {
+                "data": {
+                    "keywords": data.get("keywords", {}).get(date, []),
+                    "documents": data.get("documents", {}).get(date, []),
+                }
+            }
+        )
+
+    def update_setting(self, params, request_json):
+        updated = self.backend.update_setting(
+            int(request_json["user_id"]),
+            request_json["setting_key"],
+            request_json["value"],
+        )
+        self._send_json({"ok": updated}, 200 if updated else 404)
+
+    def update_settings(self, params, request_json):
+        if not self.backend.bulk_settings:
+            return self._send_json({"error": "not supported"}, 404)
+        user_id = int(request_json["user_id"])
+        updated = [
+            self.backend.update_setting(user_id, u["setting_key"], u["value"])
+            for u in request_json.get("updates", [])
+        ]
+        self._send_json({"ok": all(updated)}, 200 if all(updated) else 404)
+
+    def create_user(self, params, request_json):
+        user_id = int(request_json.get("user_id") or DEFAULT_USER_ID)
+        self.backend.get_settings(user_id)
+        self._send_json({"user_id": user_id})
+
+    def search_keyword(self, params, request_json):
+        self._send_json(
+            make_search_result(
+                request_json,
+                self.backend.search_results,
+                self.backend.seed,
+                self.backend.search_sources,
+            )
+        )
+
+    def make_report(self, params, request_json):
+        text = make_report_text(
+            request_json.get("keywords") or [], request_json.get("news") or []
+        )
+        if not request_json.get("stream"):
+            return self._send_json({"data": text})
+        size = max(1, -(-len(text) // REPORT_STREAM_CHUNKS))
+        self._send_sse(text[i : i + size] for i in range(0, len(text), size))
+
+
+ROUTES = {
+    ("GET", "/getSettings"): MockRequestHandler.get_settings,
+    ("GET", "/getAppConfig"): MockRequestHandler.get_app_config,
+    ("GET", "/getKeywordsSearched"): MockRequestHandler.get_keywords_searched,
+    ("GET", "/getKeywords"): MockRequestHandler.get_keywords,
+    ("PUT", "/updateSetting"): MockRequestHandler.update_setting,
+    ("PUT", "/updateSettings"): MockRequestHandler.update_settings,
+    ("POST", "/createUser"): MockRequestHandler.create_user,
+    ("POST", "/searchKeyword"): MockRequestHandler.search_keyword,
+    ("POST", "/makeReport"): MockRequestHandler.make_report,
+    ("POST", "/makeReportNew"): MockRequestHandler.make_report,
+}
+
+
+def start_server(backend, host="127.0.0.1", port=0, quiet=True):
+    """백그라운드 스레드에서 서버를 시작하고 (server, base_url) 을 반환합니다.
+
+    port=0 이면 빈 포트를 사용합니다. 종료는 server.shutdown().
+    """
+    handler = type(
+        "BoundMockRequestHandler",
+        (MockRequestHandler,),
+        {"backend": backend, "quiet": quiet},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def start_history_growth(history, interval):
+    """interval초마다 다음 날짜의 기록을 추가합니다 (증분 동기화 확인용)."""
+
+    def grow():
+        while True:
+            time.sleep(interval)
+            latest = datetime.date.fromisoformat(history.get_latest_date())
+            history.add_day(latest + datetime.timedelta(days=1))
+
+    threading.Thread(target=grow, daemon=True).start()
+
+
+def parse_endpoint_options(values, parse):
+    """['spec', '/endpoint=spec', ...] 을 (기본값, {endpoint: 값}) 으로 나눕니다."""
+    default, overrides = None, {}
+    for value in values or []:
+        endpoint, sep, spec = value.rpartition("=")
+        if sep:
+            overrides["/" + endpoint.lstrip("/")] = parse(spec)
+        else:
+            default = parse(spec)
+    return default, overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--keywords", type=int, default=DEFAULT_KEYWORDS_PER_DAY)
+    parser.add_argument("--documents", type=int, default=DEFAULT_DOCUMENTS_PER_KEYWORD)
+    parser.add_argument("--search-results", type=int, default=DEFAULT_SEARCH_RESULTS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency",
+        action="append",
+        metavar="[ENDPOINT=]SPEC",
+        help="응답 지연 분포 (예: lognormal:80:0.5, /makeReportNew=uniform:2000:6000)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        action="append",
+        metavar="[ENDPOINT=]RATE",
+        help="오류 응답 비율 0~1 (예: 0.01, /getKeywordsSearched=0.1)",
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument(
+        "--no-bulk-settings",
+        action="store_true",
+        help="/updateSettings 를 404로 응답 (설정별 저장 fallback 확인용)",
+    )
+    parser.add_argument(
+        "--no-search-sources",
+        action="store_true",
+        help="/searchKeyword 의 sources 를 무시하고 전체 소스를 검색 (소스별 검색 미지원 확인용)",
+    )
+    parser.add_argument(
+        "--grow-every",
+        type=float,
+        default=0,
+        help="N초마다 다음 날짜의 기록을 추가",
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    default_latency, latency_overrides = parse_endpoint_options(args.latency, str)
+    default_rate, rate_overrides = parse_endpoint_options(args.error_rate, float)
+    history = make_keyword_history(
+        args.days, args.keywords, args.documents, seed=args.seed
+    )
+
+    backend = MockBackend(
+        history=history,
+        latency=LatencyProfile(default_latency or "fixed:0", latency_overrides),
+        failures=FailureProfile(
+            default_rate or 0.0, rate_overrides, status=args.error_status
+        ),
+        search_results=args.search_results,
+        bulk_settings=not args.no_bulk_settings,
+        search_sources=not args.no_search_sources,
+        seed=args.seed,
+    )
+    if args.grow_every > 0:
+        start_history_growth(history, args.grow_every)
+
+    server, base_url = start_server(
+        backend, args.host, args.port, quiet=not args.verbose
+    )
+    print(
+        f"mock backend: {base_url} "
+        f"({args.days}일 x 키워드 {args.keywords} x 뉴스 {args.documents})"
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+import streamlit
+
+APP_PATH = Path(__file__).parent.parent / "app.py"
+BACKEND_URL = "http://127.0.0.1:8600"
+
+
+@pytest.fixture(scope="session")
+def app():
+    """secrets 없이 app.py 를 모듈로 불러옵니다 (main() 은 실행하지 않음)."""
+    secrets = {
+        "keyword-finder-url": BACKEND_URL,
+        "report-maker-url": BACKEND_URL,
+        "app-manager-url": BACKEND_URL,
+        "db-handler-url": BACKEND_URL + "/",
+    }
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(streamlit, "secrets", secrets)
+        spec = importlib.util.spec_from_file_location("app", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        yield module
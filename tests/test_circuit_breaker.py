@@ -0,0 +1,70 @@
+from unittest import mock
+
+import pytest
+import requests
+
+BACKEND_URL = "http://127.0.0.1:8600"
+
+
+def make_transport(app, *errors):
+    breaker = app.CircuitBreaker(failure_threshold=1, cooldown=0)
+    transport = app.HTTPTransport(circuit_breaker=breaker)
+    transport.session.request = mock.Mock(side_effect=errors)
+    return transport, breaker
+
+
+def test_connection_error_opens_circuit(app):
+    transport, breaker = make_transport(app, requests.ConnectionError("refused"))
+
+    with pytest.raises(requests.ConnectionError):
+        transport.post(f"{BACKEND_URL}/searchKeyword")
+
+    assert breaker.get_status()["/searchKeyword"]["opens"] == 1
+
+
+def test_other_error_during_probe_reopens_circuit(app):
+    transport, breaker = make_transport(
+        app,
+        requests.ConnectionError("refused"),
+        requests.exceptions.ChunkedEncodingError("connection broken"),
+        requests.ConnectionError("refused"),
+    )
+    url = f"{BACKEND_URL}/searchKeyword"
+
+    with pytest.raises(requests.ConnectionError):
+        transport.post(url)
+    # cooldown 이 지나 보낸 시험 요청이 연결 오류가 아닌 오류로 실패
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        transport.post(url)
+
+    status = breaker.get_status()["/searchKeyword"]
+    assert status["opens"] == 2
+    assert status["rejected"] == 0
+    # 시험 요청이 끝난 것으로 기록되어 다음 시험 요청을 보냄
+    with pytest.raises(requests.ConnectionError):
+        transport.post(url)
+    assert transport.session.request.call_count == 3
+
+
+def test_non_retryable_get_error_is_not_retried(app):
+    transport, breaker = make_transport(
+        app, requests.exceptions.ChunkedEncodingError("connection broken")
+    )
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        transport.get(f"{BACKEND_URL}/getSettings")
+
+    assert transport.session.request.call_count == 1
+    assert breaker.get_status()["/getSettings"]["failures"] == 1
+
+
+def test_retryable_response_is_closed_before_retry(app, monkeypatch):
+    monkeypatch.setattr(app, "HTTP_RETRY_BACKOFF", 0)
+    failed = mock.Mock(status_code=503)
+    succeeded = mock.Mock(status_code=200)
+    transport, _ = make_transport(app, failed, succeeded)
+
+    assert transport.get(f"{BACKEND_URL}/getSettings") is succeeded
+
+    failed.close.assert_called_once()
+    succeeded.close.assert_not_called()
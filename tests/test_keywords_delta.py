@@ -0,0 +1,106 @@
+def make_day(date, keyword):
+    view_key = f"VIEW#DATE#{date}#KEYWORD#{keyword}"
+    document_key = f"VIEW#DATE#{date}#DOCUMENT#{keyword}"
+    keyword_item = {"en": keyword, "ko": keyword, "viewCheckboxKey": view_key}
+    document = {"url": f"https://news.example/{date}/{keyword}", "title": keyword}
+    return {
+        "keywords": {date: [{"keyword": keyword_item, "documents": [document]}]},
+        "documents": {date: [{**document, "keywords": [keyword_item]}]},
+        "viewKeyMap": {
+            "keywordKeyMap": {
+                view_key: {"keyword": keyword_item, "documents": [document]}
+            },
+            "documentKeyMap": {
+                document_key: {"document": document, "keyword": keyword_item}
+            },
+        },
+    }
+
+
+def make_response(*days, cursor=None, is_delta=False):
+    data = {
+        "keywords": {},
+        "documents": {},
+        "viewKeyMap": {"keywordKeyMap": {}, "documentKeyMap": {}},
+    }
+    for day in days:
+        for field in ("keywords", "documents"):
+            data[field].update(day[field])
+        for name, key_map in day["viewKeyMap"].items():
+            data["viewKeyMap"][name].update(key_map)
+    if cursor is not None:
+        data["cursor"] = cursor
+    if is_delta:
+        data["isDelta"] = True
+    return {"data": data}
+
+
+def test_merge_replaces_changed_dates_and_keeps_others(app):
+    base = make_response(
+        make_day("2026-01-01", "old"),
+        make_day("2026-01-02", "stale"),
+        cursor="2026-01-02",
+    )
+    delta = make_response(
+        make_day("2026-01-02", "fresh"),
+        make_day("2026-01-03", "new"),
+        cursor="2026-01-03",
+        is_delta=True,
+    )
+
+    merged = app.merge_keywords_delta(base, delta)["data"]
+
+    assert list(merged["keywords"]) == ["2026-01-01", "2026-01-02", "2026-01-03"]
+    assert merged["keywords"]["2026-01-02"] == delta["data"]["keywords"]["2026-01-02"]
+    assert merged["keywords"]["2026-01-01"] == base["data"]["keywords"]["2026-01-01"]
+    # 바뀐 날짜의 예전 viewKeyMap 항목은 지우고 새 항목으로 교체
+    assert sorted(merged["viewKeyMap"]["keywordKeyMap"]) == [
+        "VIEW#DATE#2026-01-01#KEYWORD#old",
+        "VIEW#DATE#2026-01-02#KEYWORD#fresh",
+        "VIEW#DATE#2026-01-03#KEYWORD#new",
+    ]
+    assert sorted(merged["viewKeyMap"]["documentKeyMap"]) == [
+        "VIEW#DATE#2026-01-01#DOCUMENT#old",
+        "VIEW#DATE#2026-01-02#DOCUMENT#fresh",
+        "VIEW#DATE#2026-01-03#DOCUMENT#new",
+    ]
+    assert merged["cursor"] == "2026-01-03"
+    assert "isDelta" not in merged
+
+
+def test_merge_does_not_modify_base(app):
+    base = make_response(make_day("2026-01-01", "old"), cursor="2026-01-01")
+    before = repr(base)
+
+    app.merge_keywords_delta(
+        base,
+        make_response(make_day("2026-01-01", "fresh"), is_delta=True),
+    )
+
+    assert repr(base) == before
+
+
+def test_merge_without_delta_cursor_falls_back_to_latest_date(app):
+    base = make_response(make_day("2026-01-01", "old"))
+    delta = make_response(make_day("2026-01-05", "new"), is_delta=True)
+
+    assert app.merge_keywords_delta(base, delta)["data"]["cursor"] == "2026-01-05"
+
+
+def test_history_tables_merge_matches_dict_merge(app):
+    base = make_response(
+        make_day("2026-01-01", "old"),
+        make_day("2026-01-02", "stale"),
+        cursor="2026-01-02",
+    )
+    delta = make_response(
+        make_day("2026-01-02", "fresh"), cursor="2026-01-02", is_delta=True
+    )
+    tables = app.KeywordHistoryTables(base)
+
+    merged = tables.merge(delta)
+
+    assert merged.to_payload()["data"] == app.merge_keywords_delta(base, delta)["data"]
+    # 바뀌지 않은 날짜만 이전 버전을 유지 (검색 색인 재사용)
+    assert merged.get_version("2026-01-01") is tables.get_version("2026-01-01")
+    assert merged.get_version("2026-01-02") is not tables.get_version("2026-01-02")
@@ -0,0 +1,89 @@
+from unittest import mock
+
+import pytest
+
+USER_ID = 1038
+STATUS_KEY = "AUTO_CRON#STATUS"
+
+
+def make_settings(execution_status):
+    return {
+        "data": {
+            "viewSettings": [
+                {
+                    "settingType": "AUTO_CRON",
+                    "autoDaily": {
+                        "executionStatus": execution_status,
+                        "executionStatusKey": STATUS_KEY,
+                    },
+                }
+            ]
+        }
+    }
+
+
+def get_status(cache):
+    return cache.get(str(USER_ID))["data"]["viewSettings"][0]["autoDaily"][
+        "executionStatus"
+    ]
+
+
+@pytest.fixture
+def cache(app):
+    cache = app.TTLCache(60)
+    cache.set(str(USER_ID), make_settings(False))
+    return cache
+
+
+@pytest.fixture
+def buffer(app, cache):
+    # 타이머가 테스트 중에 저장하지 않도록 충분히 길게 둠
+    return app.SettingWriteBuffer(cache, flush_delay=60)
+
+
+def test_change_is_applied_to_cache_before_flush(buffer, cache):
+    writer = mock.Mock()
+
+    buffer.add(writer, USER_ID, STATUS_KEY, {"autoDaily": {"executionStatus": True}})
+
+    assert get_status(cache) is True
+    writer.update_settings.assert_not_called()
+
+
+def test_changes_are_merged_into_one_write(buffer):
+    writer = mock.Mock()
+    buffer.add(writer, USER_ID, STATUS_KEY, {"autoDaily": {"executionStatus": True}})
+    buffer.add(writer, USER_ID, STATUS_KEY, {"autoDaily": {"executionStatus": False}})
+
+    buffer.flush(USER_ID)
+
+    writer.update_settings.assert_called_once_with(
+        USER_ID, {STATUS_KEY: {"autoDaily": {"executionStatus": False}}}
+    )
+    assert buffer.pop_failure(USER_ID) is None
+
+
+def test_failed_write_rolls_back_cache(buffer, cache):
+    writer = mock.Mock()
+    writer.update_settings.side_effect = Exception("API 요청 실패: 500")
+    buffer.add(writer, USER_ID, STATUS_KEY, {"autoDaily": {"executionStatus": True}})
+
+    buffer.flush(USER_ID)
+
+    assert get_status(cache) is False
+    assert buffer.pop_failure(USER_ID) == ("API 요청 실패: 500", [STATUS_KEY])
+    # 실패는 한 번만 알림
+    assert buffer.pop_failure(USER_ID) is None
+
+
+def test_failed_write_without_snapshot_invalidates_cache(app):
+    cache = app.TTLCache(60)
+    buffer = app.SettingWriteBuffer(cache, flush_delay=60)
+    writer = mock.Mock()
+    writer.update_settings.side_effect = Exception("API 요청 실패: 500")
+    buffer.add(writer, USER_ID, STATUS_KEY, {"autoDaily": {"executionStatus": True}})
+    cache.set(str(USER_ID), make_settings(True))
+
+    buffer.flush(USER_ID)
+
+    assert cache.get(str(USER_ID)) is None
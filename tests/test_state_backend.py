@@ -0,0 +1,83 @@
+import pytest
+
+SCOPE = "user:1038"
+
+
+@pytest.fixture
+def backend(app, tmp_path):
+    # 삭제 표시를 한 버전만 남겨 두어 정리가 바로 일어나게 함
+    return app.SQLiteStateBackend(tmp_path / "state.sqlite3", tombstone_keep=1)
+
+
+def test_get_changes_returns_only_newer_versions(backend):
+    backend.put(SCOPE, "logs", "a", {"n": 1})
+    version, _ = backend.put(SCOPE, "logs", "b", {"n": 2})
+
+    assert backend.get_changes(SCOPE, "logs", version) == (version, [], False)
+
+    new_version, _ = backend.put(SCOPE, "logs", "a", {"n": 3})
+    version_after, changes, is_full = backend.get_changes(SCOPE, "logs", version)
+
+    assert version_after == new_version
+    # 다시 쓴 항목은 처음 추가한 순서(seq)를 유지
+    assert changes == [("a", 1, {"n": 3})]
+    assert is_full is False
+
+
+def test_delete_leaves_tombstone_for_incremental_sync(backend):
+    backend.put(SCOPE, "logs", "a", {"n": 1})
+    version, _ = backend.put(SCOPE, "logs", "b", {"n": 2})
+    backend.delete(SCOPE, "logs", ["b"])
+
+    _, changes, is_full = backend.get_changes(SCOPE, "logs", version)
+
+    assert changes == [("b", 2, None)]
+    assert is_full is False
+
+
+def test_pruned_tombstones_force_full_resync(app, backend):
+    stale = app.StateCollection(backend, SCOPE, "logs")
+    writer = app.StateCollection(backend, SCOPE, "logs")
+    writer.put("a", {"n": 1})
+    writer.put("b", {"n": 2})
+    stale.sync()
+    assert list(stale.keys()) == ["a", "b"]
+
+    # 두 번째 삭제에서 "a"의 삭제 표시가 정리되어 stale 사본은 증분으로 따라갈 수 없음
+    writer.delete(["a"])
+    writer.delete(["b"])
+    writer.put("c", {"n": 3})
+    version, _, is_full = backend.get_changes(SCOPE, "logs", stale.version)
+    revision = stale.revision
+    stale.sync()
+
+    assert is_full is True
+    assert list(stale.items()) == [("c", {"n": 3})]
+    assert stale.version == version
+    assert stale.revision > revision
+
+
+def test_sync_orders_items_by_insertion(app, backend):
+    first = app.StateCollection(backend, SCOPE, "logs")
+    second = app.StateCollection(backend, SCOPE, "logs")
+    first.put("a", 1)
+    second.sync()
+    second.put("b", 2)
+    first.put("c", 3)
+    second.put("a", 4)
+
+    first.sync()
+
+    assert list(first.items()) == [("a", 4), ("b", 2), ("c", 3)]
+
+
+def test_own_write_is_not_read_back(app, backend):
+    collection = app.StateCollection(backend, SCOPE, "logs")
+    collection.put("a", 1)
+    revision = collection.revision
+
+    collection.sync()
+
+    # 다른 곳의 변경이 없으면 방금 쓴 값을 다시 읽지 않음
+    assert collection.revision == revision
+    assert collection.get("a") == 1